@@ -129,7 +129,7 @@ class ObservabilityManager:
             # Apply component-specific log level
             component_level = self.config.logging.component_levels.get(component)
             if component_level:
-                logger._logger.setLevel(getattr(__import__("logging"), component_level.upper()))
+                logger.set_level(component_level)
 
             self._loggers[cache_key] = logger
 
@@ -14,16 +14,40 @@ import json
 import logging
 import sys
 import threading
+import time
 import traceback
+import weakref
 from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime
+from json.encoder import encode_basestring_ascii as _json_escape
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterator, Optional
 
 
-# Thread-local storage for trace/span context
-_trace_context = threading.local()
+# Trace/span context. Each asyncio task inherits a copy of its creator's context,
+# but new threads start empty unless run via contextvars.copy_context().run
+_trace_id_var: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+_span_id_var: ContextVar[Optional[str]] = ContextVar("span_id", default=None)
+
+# Log level names accepted by SamLogger
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
+def _json_value(value: Any) -> str:
+    """Encode a single value the way json.dumps would."""
+    if isinstance(value, str):
+        return _json_escape(value)
+    if value is None:
+        return "null"
+    return json.dumps(value)
 
 
 @dataclass
@@ -57,8 +81,25 @@ class LogEntry:
         }
 
     def to_json(self) -> str:
-        """Convert to JSON string."""
-        return json.dumps(self.to_dict())
+        """
+        Convert to JSON string.
+
+        The key layout is fixed, so the key fragments are constants and only
+        the values are encoded. Output matches json.dumps(self.to_dict()).
+        """
+        return "".join((
+            '{"timestamp": ', _json_value(self.timestamp),
+            ', "level": ', _json_value(self.level),
+            ', "component": ', _json_value(self.component),
+            ', "feature_id": ', _json_value(self.feature_id),
+            ', "task_id": ', _json_value(self.task_id),
+            ', "message": ', _json_value(self.message),
+            ', "context": ', _json_value(self.context),
+            ', "trace_id": ', _json_value(self.trace_id),
+            ', "span_id": ', _json_value(self.span_id),
+            ', "exception": ', _json_value(self.exception),
+            "}",
+        ))
 
 
 class TextFormatter(logging.Formatter):
@@ -74,30 +115,48 @@ class TextFormatter(logging.Formatter):
         "RESET": "\033[0m",
     }
 
-    def __init__(self, show_context: bool = True):
+    def __init__(self, show_context: bool = True, use_color: Optional[bool] = None):
+        """
+        Create a text formatter.
+
+        Args:
+            show_context: Whether to append feature/task context
+            use_color: Emit ANSI colors (defaults to whether stdout is a TTY)
+        """
         super().__init__()
         self.show_context = show_context
+        if use_color is None:
+            use_color = sys.stdout.isatty()
+        # Resolve the color table once so format() never branches on it
+        self._colors = self.COLORS if use_color else {"RESET": ""}
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record for human-readable output."""
         level = record.levelname
-        color = self.COLORS.get(level, "")
-        reset = self.COLORS["RESET"]
+        color = self._colors.get(level, "")
+        reset = self._colors["RESET"]
+        component = getattr(record, "component", "unknown")
+        feature_id = getattr(record, "feature_id", None) if self.show_context else None
+        task_id = getattr(record, "task_id", None) if self.show_context else None
+
+        # Fast path: no context and no exception to append
+        if not (feature_id or task_id or record.exc_info):
+            return f"{color}[{level}]{reset} {component}: {record.getMessage()}"
 
         # Base format: [LEVEL] component: message
         parts = [
             f"{color}[{level}]{reset}",
-            f"{getattr(record, 'component', 'unknown')}:",
+            f"{component}:",
             record.getMessage(),
         ]
 
         # Add context if present
-        if self.show_context:
+        if feature_id or task_id:
             context_parts = []
-            if hasattr(record, "feature_id") and record.feature_id:
-                context_parts.append(f"feature={record.feature_id}")
-            if hasattr(record, "task_id") and record.task_id:
-                context_parts.append(f"task={record.task_id}")
+            if feature_id:
+                context_parts.append(f"feature={feature_id}")
+            if task_id:
+                context_parts.append(f"task={task_id}")
 
             if context_parts:
                 parts.append(f"({', '.join(context_parts)})")
@@ -134,13 +193,13 @@ class JSONFormatter(logging.Formatter):
 
     @staticmethod
     def _get_trace_id() -> Optional[str]:
-        """Get current trace ID from thread-local storage."""
-        return getattr(_trace_context, "trace_id", None)
+        """Get current trace ID from the trace context."""
+        return _trace_id_var.get()
 
     @staticmethod
     def _get_span_id() -> Optional[str]:
-        """Get current span ID from thread-local storage."""
-        return getattr(_trace_context, "span_id", None)
+        """Get current span ID from the trace context."""
+        return _span_id_var.get()
 
 
 class SamLogger:
@@ -154,6 +213,7 @@ class SamLogger:
     # Class-level configuration
     _log_dir: Optional[Path] = None
     _loggers: Dict[str, logging.Logger] = {}
+    _instances: "weakref.WeakSet[SamLogger]" = weakref.WeakSet()
     _initialized = False
 
     @classmethod
@@ -168,17 +228,19 @@ class SamLogger:
         if cls._initialized:
             return
 
+        level_no = _LEVELS[level.upper()]
         cls._log_dir = log_dir or Path(".sam/logs")
         cls._log_dir.mkdir(parents=True, exist_ok=True)
 
         # Create root logger
         root_logger = logging.getLogger("sam")
-        root_logger.setLevel(getattr(logging, level.upper()))
+        root_logger.setLevel(level_no)
         root_logger.handlers.clear()
 
         # Console handler (text format)
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(TextFormatter())
+        isatty = getattr(console_handler.stream, "isatty", None)
+        console_handler.setFormatter(TextFormatter(use_color=bool(isatty and isatty())))
         console_handler.setLevel(logging.INFO)  # Less verbose on console
         root_logger.addHandler(console_handler)
 
@@ -186,10 +248,17 @@ class SamLogger:
         log_file = cls._log_dir / "sam.log"
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(JSONFormatter())
-        file_handler.setLevel(getattr(logging, level.upper()))
+        file_handler.setLevel(level_no)
         root_logger.addHandler(file_handler)
 
         cls._initialized = True
+        cls._refresh_all_levels()
+
+    @classmethod
+    def _refresh_all_levels(cls) -> None:
+        """Recompute cached level flags on every live SamLogger."""
+        for instance in list(cls._instances):
+            instance._refresh_levels()
 
     def __init__(
         self,
@@ -222,6 +291,26 @@ class SamLogger:
         self._logger = self._loggers[logger_name]
         self._context: Dict[str, Any] = {}
 
+        self._refresh_levels()
+        SamLogger._instances.add(self)
+
+    def _refresh_levels(self) -> None:
+        """Cache which of the hot levels are enabled for this logger."""
+        self._debug_enabled = self._logger.isEnabledFor(logging.DEBUG)
+        self._info_enabled = self._logger.isEnabledFor(logging.INFO)
+        self._warning_enabled = self._logger.isEnabledFor(logging.WARNING)
+
+    def set_level(self, level: str) -> None:
+        """
+        Set the log level for this logger's component.
+
+        Args:
+            level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        """
+        self._logger.setLevel(_LEVELS[level.upper()])
+        # Loggers for the same component share the underlying Python logger
+        SamLogger._refresh_all_levels()
+
     def _log(
         self,
         level: int,
@@ -236,6 +325,9 @@ class SamLogger:
             message: Log message
             **context: Additional context key-value pairs
         """
+        if not self._logger.isEnabledFor(level):
+            return
+
         # Merge instance context with call context
         merged_context = {**self._context, **context}
 
@@ -248,11 +340,11 @@ class SamLogger:
         }
 
         # Add trace/span IDs if available
-        trace_id = getattr(_trace_context, "trace_id", None)
+        trace_id = _trace_id_var.get()
         if trace_id:
             extra["trace_id"] = trace_id
 
-        span_id = getattr(_trace_context, "span_id", None)
+        span_id = _span_id_var.get()
         if span_id:
             extra["span_id"] = span_id
 
@@ -260,11 +352,13 @@ class SamLogger:
 
     def info(self, message: str, **context) -> None:
         """Log info message."""
-        self._log(logging.INFO, message, **context)
+        if self._info_enabled:
+            self._log(logging.INFO, message, **context)
 
     def warning(self, message: str, **context) -> None:
         """Log warning message."""
-        self._log(logging.WARNING, message, **context)
+        if self._warning_enabled:
+            self._log(logging.WARNING, message, **context)
 
     def error(
         self,
@@ -296,7 +390,8 @@ class SamLogger:
 
     def debug(self, message: str, **context) -> None:
         """Log debug message."""
-        self._log(logging.DEBUG, message, **context)
+        if self._debug_enabled:
+            self._log(logging.DEBUG, message, **context)
 
     def critical(self, message: str, **context) -> None:
         """Log critical message."""
@@ -321,21 +416,26 @@ class SamLogger:
         """
         Context manager for timing operations.
 
+        Logs the duration at INFO on completion; the start is only logged
+        at DEBUG. No timing is done when INFO is disabled.
+
         Args:
             operation_name: Name of the operation being timed
 
         Yields:
             None
         """
-        import time
+        if not self._info_enabled:
+            yield
+            return
 
-        self.info(f"Starting: {operation_name}")
-        start = time.time()
+        self.debug(f"Starting: {operation_name}")
+        start = time.perf_counter_ns()
 
         try:
             yield
         finally:
-            duration_ms = (time.time() - start) * 1000
+            duration_ms = (time.perf_counter_ns() - start) / 1_000_000
             self.info(
                 f"Completed: {operation_name}",
                 operation=operation_name,
@@ -344,7 +444,7 @@ class SamLogger:
 
 
 # Global logger instances cache
-_logger_cache: Dict[str, SamLogger] = {}
+_logger_cache: Dict[tuple, SamLogger] = {}
 _cache_lock = threading.Lock()
 
 
@@ -359,7 +459,12 @@ def get_logger(component: str, **context) -> SamLogger:
     Returns:
         SamLogger instance
     """
-    cache_key = (component, tuple(sorted(context.items())))
+    # Only feature_id and task_id distinguish loggers for a component
+    cache_key = (component, context.get("feature_id"), context.get("task_id"))
+
+    logger = _logger_cache.get(cache_key)
+    if logger is not None:
+        return logger
 
     with _cache_lock:
         if cache_key not in _logger_cache:
@@ -370,21 +475,21 @@ def get_logger(component: str, **context) -> SamLogger:
 
 def set_trace_context(trace_id: str, span_id: Optional[str] = None) -> None:
     """
-    Set trace context for current thread.
+    Set trace context for the current thread or task.
 
     Args:
         trace_id: Trace ID
         span_id: Optional span ID
     """
-    _trace_context.trace_id = trace_id
+    _trace_id_var.set(trace_id)
     if span_id:
-        _trace_context.span_id = span_id
+        _span_id_var.set(span_id)
 
 
 def clear_trace_context() -> None:
-    """Clear trace context for current thread."""
-    _trace_context.trace_id = None
-    _trace_context.span_id = None
+    """Clear trace context for the current thread or task."""
+    _trace_id_var.set(None)
+    _span_id_var.set(None)
 
 
 def get_trace_context() -> tuple[Optional[str], Optional[str]]:
@@ -394,10 +499,7 @@ def get_trace_context() -> tuple[Optional[str], Optional[str]]:
     Returns:
         Tuple of (trace_id, span_id)
     """
-    return (
-        getattr(_trace_context, "trace_id", None),
-        getattr(_trace_context, "span_id", None),
-    )
+    return _trace_id_var.get(), _span_id_var.get()
 
 
 if __name__ == "__main__":
@@ -10,19 +10,46 @@ Provides:
 """
 
 import json
+import os
 import sys
 import threading
 import time
-import uuid
 from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterator, List, Optional, OrderedDict
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-# Thread-local storage for current span
-_current_span = threading.local()
+
+# Current span. Each asyncio task inherits a copy of its creator's context,
+# but new threads start empty unless run via contextvars.copy_context().run
+_current_span: "ContextVar[Optional[Span]]" = ContextVar("current_span", default=None)
+
+
+def _json_line(data: Dict[str, Any]) -> bytes:
+    """Serialize data as one JSON Lines record, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        try:
+            # Span attributes may use non-str keys, which json.dumps accepts
+            return orjson.dumps(
+                data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+            )
+        except TypeError:
+            # e.g. integers beyond 64 bits; let the stdlib encoder decide
+            pass
+    return json.dumps(data).encode("utf-8") + b"\n"
+
+
+def _short_id() -> str:
+    """Generate an 8-character hex ID for traces and spans."""
+    return os.urandom(4).hex()
 
 
 @dataclass
@@ -44,13 +71,16 @@ class Span:
 
     operation_name: str
     trace_id: str
-    span_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    span_id: str = field(default_factory=_short_id)
     parent_id: Optional[str] = None
     start_time: float = field(default_factory=time.time)
     end_time: Optional[float] = None
     attributes: Dict[str, Any] = field(default_factory=dict)
     events: List[SpanEvent] = field(default_factory=list)
     status: str = "ok"  # ok, error, internal_error
+    # Monotonic clock readings used for durations; wall times are for export
+    start_ns: int = field(default_factory=time.monotonic_ns, repr=False)
+    end_ns: Optional[int] = field(default=None, repr=False)
 
     def set_attribute(self, key: str, value: Any) -> None:
         """Set an attribute on the span."""
@@ -79,16 +109,13 @@ class Span:
         if self.end_time is not None:
             return  # Already ended
 
+        self.end_ns = time.monotonic_ns()
         self.end_time = time.time()
         if attributes:
             self.attributes.update(attributes)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert span to dictionary."""
-        duration_ms = None
-        if self.end_time:
-            duration_ms = round((self.end_time - self.start_time) * 1000, 2)
-
         return {
             "operation": self.operation_name,
             "trace_id": self.trace_id,
@@ -96,7 +123,7 @@ class Span:
             "parent_id": self.parent_id,
             "start_time": datetime.fromtimestamp(self.start_time).isoformat(),
             "end_time": datetime.fromtimestamp(self.end_time).isoformat() if self.end_time else None,
-            "duration_ms": duration_ms,
+            "duration_ms": self.get_duration_ms(),
             "status": self.status,
             "attributes": self.attributes,
             "events": [
@@ -111,8 +138,8 @@ class Span:
 
     def get_duration_ms(self) -> Optional[float]:
         """Get span duration in milliseconds."""
-        if self.end_time:
-            return round((self.end_time - self.start_time) * 1000, 2)
+        if self.end_ns is not None:
+            return round((self.end_ns - self.start_ns) / 1e6, 2)
         return None
 
 
@@ -130,10 +157,26 @@ class Trace:
     start_time: float = field(default_factory=time.time)
     end_time: Optional[float] = None
     attributes: Dict[str, Any] = field(default_factory=dict)
+    _span_index: Dict[str, Span] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _children_index: Optional[Dict[str, List[Span]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Index any spans passed at construction."""
+        self._span_index = {s.span_id: s for s in self.spans}
 
     def add_span(self, span: Span) -> None:
         """Add a span to the trace."""
-        self.spans.append(span)
+        with self._lock:
+            self.spans.append(span)
+            self._span_index[span.span_id] = span
+            self._children_index = None
 
     def end(self) -> None:
         """End the trace."""
@@ -158,10 +201,23 @@ class Trace:
 
     def get_span_by_id(self, span_id: str) -> Optional[Span]:
         """Get a span by its ID."""
-        for span in self.spans:
-            if span.span_id == span_id:
-                return span
-        return None
+        return self._span_index.get(span_id)
+
+    def _get_children_index(self) -> Dict[str, List[Span]]:
+        """
+        Get child spans keyed by parent span ID.
+
+        Spans whose parent is not part of this trace are listed under "".
+        The index is cached until the next add_span().
+        """
+        with self._lock:
+            if self._children_index is None:
+                children: Dict[str, List[Span]] = {"": []}
+                for span in self.spans:
+                    parent_id = span.parent_id if span.parent_id in self._span_index else ""
+                    children.setdefault(parent_id, []).append(span)
+                self._children_index = children
+            return self._children_index
 
     def get_span_hierarchy(self) -> List[Dict[str, Any]]:
         """
@@ -170,27 +226,21 @@ class Trace:
         Returns:
             List of root spans with nested children
         """
-        span_map = {s.span_id: s for s in self.spans}
-        roots = []
-        children_map: Dict[str, List[Dict]] = {s.span_id: [] for s in self.spans}
-
-        # Build children map
-        for span in self.spans:
-            if span.parent_id and span.parent_id in children_map:
-                children_map[span.parent_id].append(span.to_dict())
-            else:
-                roots.append(span.to_dict())
-
-        # Add children to parent dicts
-        def add_children(span_dict: Dict) -> None:
-            span_id = span_dict.get("span_id")
-            if span_id in children_map:
-                span_dict["children"] = children_map[span_id]
-                for child in span_dict["children"]:
-                    add_children(child)
-
-        for root in roots:
-            add_children(root)
+        children_index = self._get_children_index()
+        roots: List[Dict[str, Any]] = []
+
+        # Iterative depth-first build; children are pushed in reverse so
+        # they are attached in their original order.
+        stack: List[tuple[Span, List[Dict[str, Any]]]] = [
+            (span, roots) for span in reversed(children_index[""])
+        ]
+        while stack:
+            span, siblings = stack.pop()
+            span_dict = span.to_dict()
+            span_dict["children"] = []
+            siblings.append(span_dict)
+            for child in reversed(children_index.get(span.span_id, [])):
+                stack.append((child, span_dict["children"]))
 
         return roots
 
@@ -199,7 +249,7 @@ class TracingContext:
     """
     Manage distributed tracing context across SAM skills.
 
-    Provides thread-local span management and trace export.
+    Provides per-context span management and trace export.
     """
 
     def __init__(self, component: str, storage_dir: Optional[Path] = None):
@@ -214,7 +264,9 @@ class TracingContext:
         self.storage_dir = storage_dir or Path(".sam/traces")
         self.storage_dir.mkdir(parents=True, exist_ok=True)
 
-        # Active traces
+        # Active traces. Single-key dict reads and writes are atomic, so the
+        # lock only guards compound operations; span appends use each
+        # trace's own lock.
         self._traces: Dict[str, Trace] = {}
         self._lock = threading.RLock()
 
@@ -230,9 +282,9 @@ class TracingContext:
             Tuple of (trace_id, root_span)
         """
         if not trace_id:
-            trace_id = str(uuid.uuid4())[:8]
+            trace_id = _short_id()
 
-        span_id = str(uuid.uuid4())[:8]
+        span_id = _short_id()
         root_span = Span(
             operation_name=operation_name,
             trace_id=trace_id,
@@ -244,9 +296,7 @@ class TracingContext:
             root_operation=operation_name,
         )
         trace.add_span(root_span)
-
-        with self._lock:
-            self._traces[trace_id] = trace
+        self._traces[trace_id] = trace
 
         # Set as current span
         self._set_current_span(root_span)
@@ -275,9 +325,9 @@ class TracingContext:
         if not trace_id and current_span:
             trace_id = current_span.trace_id
         elif not trace_id:
-            trace_id = str(uuid.uuid4())[:8]
+            trace_id = _short_id()
             # Start new trace
-            return self.start_span(operation_name, trace_id, parent)[1]
+            return self.start_span(operation_name, trace_id, parent)
 
         parent_id = parent.span_id if parent else (current_span.span_id if current_span else None)
 
@@ -287,15 +337,13 @@ class TracingContext:
             parent_id=parent_id,
         )
 
-        # Add to trace
-        with self._lock:
-            if trace_id in self._traces:
-                self._traces[trace_id].add_span(span)
-            else:
-                # Create new trace
-                trace = Trace(trace_id=trace_id, root_operation=operation_name)
-                trace.add_span(span)
-                self._traces[trace_id] = trace
+        # Add to trace, creating it if this is the first span
+        trace = self._traces.get(trace_id)
+        if trace is None:
+            trace = self._traces.setdefault(
+                trace_id, Trace(trace_id=trace_id, root_operation=operation_name)
+            )
+        trace.add_span(span)
 
         # Set as current span
         self._set_current_span(span)
@@ -313,22 +361,18 @@ class TracingContext:
         span.end(attributes)
 
         # Update trace end time if this was the root span
-        with self._lock:
-            if span.trace_id in self._traces:
-                trace = self._traces[span.trace_id]
-                # Check if this is the root span
-                if trace.spans and trace.spans[0].span_id == span.span_id:
-                    trace.end()
+        trace = self._traces.get(span.trace_id)
+        if trace and trace.spans and trace.spans[0].span_id == span.span_id:
+            trace.end()
 
         # Clear current span if it's this one
         if self._get_current_span() == span:
             parent_id = span.parent_id
             if parent_id:
                 # Set parent as current
-                for s in self._traces.get(span.trace_id, Trace(span.trace_id, "")).spans:
-                    if s.span_id == parent_id:
-                        self._set_current_span(s)
-                        break
+                parent = trace.get_span_by_id(parent_id) if trace else None
+                if parent:
+                    self._set_current_span(parent)
             else:
                 self._clear_current_span()
 
@@ -342,8 +386,7 @@ class TracingContext:
         Returns:
             Trace or None if not found
         """
-        with self._lock:
-            return self._traces.get(trace_id)
+        return self._traces.get(trace_id)
 
     def export_trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -382,28 +425,57 @@ class TracingContext:
 
     def save_all_traces(self) -> List[Path]:
         """Save all traces to disk."""
-        paths = []
         with self._lock:
-            for trace_id in list(self._traces.keys()):
-                path = self.save_trace(trace_id)
-                if path:
-                    paths.append(path)
+            trace_ids = list(self._traces)
+
+        paths = []
+        for trace_id in trace_ids:
+            path = self.save_trace(trace_id)
+            if path:
+                paths.append(path)
         return paths
 
+    def save_all_traces_aggregated(self, path: Optional[Path] = None) -> Optional[Path]:
+        """
+        Append all traces to a single JSON Lines file.
+
+        Traces are serialized into one buffer and written with a single
+        open/write, instead of one file per trace.
+
+        Args:
+            path: Output file (defaults to traces.jsonl in the storage directory)
+
+        Returns:
+            Path to the file or None if there are no traces
+        """
+        with self._lock:
+            traces = list(self._traces.values())
+
+        if not traces:
+            return None
+
+        lines = [_json_line(trace.to_dict()) for trace in traces]
+
+        file_path = path or self.storage_dir / "traces.jsonl"
+        with open(file_path, "ab") as f:
+            f.write(b"".join(lines))
+
+        return file_path
+
     @staticmethod
     def _get_current_span() -> Optional[Span]:
-        """Get current span from thread-local storage."""
-        return getattr(_current_span, "value", None)
+        """Get current span from the span context."""
+        return _current_span.get()
 
     @staticmethod
     def _set_current_span(span: Span) -> None:
-        """Set current span in thread-local storage."""
-        _current_span.value = span
+        """Set current span in the span context."""
+        _current_span.set(span)
 
     @staticmethod
     def _clear_current_span() -> None:
-        """Clear current span from thread-local storage."""
-        _current_span.value = None
+        """Clear current span from the span context."""
+        _current_span.set(None)
 
     @staticmethod
     def get_current_trace_id() -> Optional[str]:
@@ -21,106 +21,25 @@ from datetime import datetime
 from typing import Dict, List, Any
 from stringcase import snakecase
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-class AcceptanceTestGenerator:
-    """Generate acceptance tests from task specifications."""
-
-    def __init__(self, feature_dir: Path):
-        self.feature_dir = feature_dir
-        self.tasks_file = feature_dir / "TASKS.json"
-        self.scenarios_file = feature_dir / "SCENARIOS.json"
-        self.tasks_data: Dict[str, Any] = {}
-        self.scenarios_data: Dict[str, Any] = {}
-
-    def load_data(self):
-        """Load TASKS.json and SCENARIOS.json."""
-        with open(self.tasks_file, 'r') as f:
-            self.tasks_data = json.load(f)
-
-        if self.scenarios_file.exists():
-            with open(self.scenarios_file, 'r') as f:
-                self.scenarios_data = json.load(f)
-
-    def generate_all(self):
-        """Generate acceptance tests for all tasks."""
-        self.load_data()
-
-        feature_id = self.tasks_data["metadata"]["feature_id"]
-        feature_name = self.tasks_data["metadata"]["feature_name"]
-
-        # Create tests directory
-        tests_dir = self.feature_dir / "tests" / "acceptance"
-        tests_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate acceptance test file
-        test_file = tests_dir / f"test_{snakecase(feature_name)}_acceptance.ts"
-
-        content = self._generate_header(feature_name)
-        content += self._generate_imports()
-
-        # Generate tests for each phase
-        for phase in self.tasks_data.get("phases", []):
-            content += self._generate_phase_tests(phase)
-
-        content += self._generate_footer()
-
-        with open(test_file, 'w') as f:
-            f.write(content)
-
-        print(f"✓ Generated acceptance tests: {test_file}")
-
-        # Generate acceptance test status tracker
-        self._generate_status_tracker(tests_dir)
-
-    def _generate_header(self, feature_name: str) -> str:
-        """Generate test file header."""
-        return f'''/**
- * Auto-generated acceptance tests for task verification
- * Feature: {feature_name}
- * Generated: {datetime.now().isoformat()}
- *
- * These tests validate that each task meets its acceptance criteria.
- * Run after each task completion for shift-left verification.
- */
-
-'''
 
-    def _generate_imports(self) -> str:
-        """Generate import statements."""
-        return '''import {{ test, expect }} from '@jest/globals';
-import {{ acceptTask, TaskResult }} from '../helpers/task-acceptance';
+def _load_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when available."""
+    raw = path.read_bytes()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
 
-'''
 
-    def _generate_phase_tests(self, phase: Dict[str, Any]) -> str:
-        """Generate tests for a phase."""
-        content = f"describe('Phase {phase['phase_id']}: {phase['phase_name']}', () => {{\n"
-
-        # Generate tests for each task
-        for task in phase.get("tasks", []):
-            content += self._generate_task_test(task)
-
-        content += "});\n\n"
-        return content
-
-    def _generate_task_test(self, task: Dict[str, Any]) -> str:
-        """Generate acceptance test for a single task."""
-        task_id = task["task_id"]
-        title = task["title"]
-        story_mapping = task.get("story_mapping", "")
-
-        content = f"""
+# Per-task acceptance test block; braces in the TypeScript are doubled for str.format
+_TASK_TEMPLATE = """
   describe('Task {task_id}: {title}', () => {{
     const taskId = '{task_id}';
-"""
-
-        # Add story mapping info
-        if story_mapping:
-            content += f"    const storyMapping = '{story_mapping}';\n"
-
-        # Add acceptance criteria test
-        content += """
-    it('should meet all acceptance criteria', async () => {
+{story_line}
+    it('should meet all acceptance criteria', async () => {{
       const result: TaskResult = await acceptTask(taskId);
 
       // Verify implementation exists
@@ -132,9 +51,9 @@ import {{ acceptTask, TaskResult }} from '../helpers/task-acceptance';
 
       // Verify no blocking issues
       expect(result.blockingIssues).toEqual([]);
-    });
+    }});
 
-    it('should pass quality gates', async () => {
+    it('should pass quality gates', async () => {{
       const result: TaskResult = await acceptTask(taskId);
 
       // Linting passes
@@ -145,9 +64,9 @@ import {{ acceptTask, TaskResult }} from '../helpers/task-acceptance';
 
       // Build succeeds
       expect(result.qualityGates.build).toBe('passed');
-    });
+    }});
 
-    it('should have test coverage', async () => {
+    it('should have test coverage', async () => {{
       const result: TaskResult = await acceptTask(taskId);
 
       // Tests exist for this task
@@ -158,43 +77,12 @@ import {{ acceptTask, TaskResult }} from '../helpers/task-acceptance';
 
       // Coverage meets threshold
       expect(result.tests.coverage).toBeGreaterThanOrEqual(80);
-    });
-  });
+    }});
+  }});
 """
 
-        return content
-
-    def _generate_footer(self) -> str:
-        """Generate test file footer."""
-        return """
-/**
- * Task Acceptance Helper
- *
- * This helper function validates task completion:
- *
- * 1. Implementation exists (files created, code written)
- * 2. Acceptance criteria pass (scenarios from EXECUTABLE_SPEC.yaml)
- * 3. Quality gates pass (lint, type-check, build)
- * 4. Tests exist and pass with sufficient coverage
- *
- * Usage:
- *   const result = await acceptTask('1.1');
- *   if (result.acceptanceCriteria.passed) {
- *     // Task can be marked as [x]
- *   }
- */
-
-async function acceptTask(taskId: string): Promise<TaskResult> {
-  // Implementation in task-acceptance.ts
-  return {} as TaskResult;
-}
-"""
-
-    def _generate_status_tracker(self, tests_dir: Path):
-        """Generate acceptance test status tracker."""
-        tracker_file = tests_dir / "task-acceptance.ts"
-
-        content = '''/**
+# Static helper module written next to the generated acceptance tests
+_STATUS_TRACKER_BYTES = '''/**
  * Task Acceptance Helper Functions
  *
  * These functions help verify that tasks meet their acceptance criteria
@@ -258,10 +146,142 @@ export async function acceptTask(taskId: string): Promise<TaskResult> {
 
   return result;
 }
+'''.encode('utf-8')
+
+
+class AcceptanceTestGenerator:
+    """Generate acceptance tests from task specifications."""
+
+    def __init__(self, feature_dir: Path):
+        self.feature_dir = feature_dir
+        self.tasks_file = feature_dir / "TASKS.json"
+        self.scenarios_file = feature_dir / "SCENARIOS.json"
+        self.tasks_data: Dict[str, Any] = {}
+        self.scenarios_data: Dict[str, Any] = {}
+
+    def load_data(self):
+        """Load TASKS.json and SCENARIOS.json."""
+        self.tasks_data = _load_json(self.tasks_file)
+
+        # SCENARIOS.json is optional
+        try:
+            self.scenarios_data = _load_json(self.scenarios_file)
+        except FileNotFoundError:
+            pass
+
+    def generate_all(self):
+        """Generate acceptance tests for all tasks."""
+        self.load_data()
+
+        feature_id = self.tasks_data["metadata"]["feature_id"]
+        feature_name = self.tasks_data["metadata"]["feature_name"]
+
+        # Create tests directory
+        tests_dir = self.feature_dir / "tests" / "acceptance"
+        tests_dir.mkdir(parents=True, exist_ok=True)
+
+        # Generate acceptance test file
+        test_file = tests_dir / f"test_{snakecase(feature_name)}_acceptance.ts"
+
+        # One timestamp for everything generated in this run
+        generated_at = datetime.now().isoformat()
+
+        parts: List[str] = [
+            self._generate_header(feature_name, generated_at),
+            self._generate_imports(),
+        ]
+
+        # Generate tests for each phase
+        for phase in self.tasks_data.get("phases", []):
+            parts.append(self._generate_phase_tests(phase))
+
+        parts.append(self._generate_footer())
+
+        test_file.write_bytes(''.join(parts).encode('utf-8'))
+
+        print(f"✓ Generated acceptance tests: {test_file}")
+
+        # Generate acceptance test status tracker
+        self._generate_status_tracker(tests_dir)
+
+    def _generate_header(self, feature_name: str, generated_at: str) -> str:
+        """Generate test file header."""
+        return f'''/**
+ * Auto-generated acceptance tests for task verification
+ * Feature: {feature_name}
+ * Generated: {generated_at}
+ *
+ * These tests validate that each task meets its acceptance criteria.
+ * Run after each task completion for shift-left verification.
+ */
+
 '''
 
-        with open(tracker_file, 'w') as f:
-            f.write(content)
+    def _generate_imports(self) -> str:
+        """Generate import statements."""
+        return '''import {{ test, expect }} from '@jest/globals';
+import {{ acceptTask, TaskResult }} from '../helpers/task-acceptance';
+
+'''
+
+    def _generate_phase_tests(self, phase: Dict[str, Any]) -> str:
+        """Generate tests for a phase."""
+        parts = [f"describe('Phase {phase['phase_id']}: {phase['phase_name']}', () => {{\n"]
+
+        # Generate tests for each task
+        parts.extend(self._generate_task_test(task) for task in phase.get("tasks", []))
+
+        parts.append("});\n\n")
+        return ''.join(parts)
+
+    def _generate_task_test(self, task: Dict[str, Any]) -> str:
+        """Generate acceptance test for a single task."""
+        story_mapping = task.get("story_mapping", "")
+
+        return _TASK_TEMPLATE.format(
+            task_id=task["task_id"],
+            title=task["title"],
+            story_line=f"    const storyMapping = '{story_mapping}';\n" if story_mapping else "",
+        )
+
+    def _generate_footer(self) -> str:
+        """Generate test file footer."""
+        return """
+/**
+ * Task Acceptance Helper
+ *
+ * This helper function validates task completion:
+ *
+ * 1. Implementation exists (files created, code written)
+ * 2. Acceptance criteria pass (scenarios from EXECUTABLE_SPEC.yaml)
+ * 3. Quality gates pass (lint, type-check, build)
+ * 4. Tests exist and pass with sufficient coverage
+ *
+ * Usage:
+ *   const result = await acceptTask('1.1');
+ *   if (result.acceptanceCriteria.passed) {
+ *     // Task can be marked as [x]
+ *   }
+ */
+
+async function acceptTask(taskId: string): Promise<TaskResult> {
+  // Implementation in task-acceptance.ts
+  return {} as TaskResult;
+}
+"""
+
+    def _generate_status_tracker(self, tests_dir: Path):
+        """Generate acceptance test status tracker (skipped if already current)."""
+        tracker_file = tests_dir / "task-acceptance.ts"
+
+        try:
+            if tracker_file.read_bytes() == _STATUS_TRACKER_BYTES:
+                print(f"✓ Acceptance tracker up to date: {tracker_file}")
+                return
+        except FileNotFoundError:
+            pass
+
+        tracker_file.write_bytes(_STATUS_TRACKER_BYTES)
 
         print(f"✓ Generated acceptance tracker: {tracker_file}")
 
@@ -16,18 +16,19 @@ Output:
 import sys
 import json
 import logging
+import re
 from pathlib import Path
-from typing import Optional, TypedDict, List, Dict, Any, cast
+from types import MappingProxyType
+from typing import Optional, TypedDict, List, Dict, Any, Mapping, cast
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
 try:
-    from codebase_analyzer import HybridCodebaseAnalyzer
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    # Fallback if running directly
-    logging.warning("Could not import codebase_analyzer, using standalone classification")
-    from codebase_analyzer import HybridCodebaseAnalyzer
+    ORJSON_AVAILABLE = False
 
 
 # Project type phase configurations
@@ -40,7 +41,7 @@ class PhaseStructureDict(TypedDict):
     api_section: Optional[str]
     database_section: Optional[str]
 
-PHASE_STRUCTURES: Dict[str, PhaseStructureDict] = {
+_PHASE_STRUCTURES: Dict[str, PhaseStructureDict] = {
     "baas-fullstack": {
         "phases": [
             {"id": "1", "name": "Foundation"},
@@ -85,17 +86,26 @@ PHASE_STRUCTURES: Dict[str, PhaseStructureDict] = {
     }
 }
 
+# Matches "project_type: <value>" metadata lines in feature documentation
+_PROJECT_TYPE_RE = re.compile(r'project_type\s*:\s*([A-Za-z0-9_-]+)', re.IGNORECASE)
+
+# Read-only views so the shared configurations cannot be mutated by callers
+PHASE_STRUCTURES: Dict[str, Mapping[str, Any]] = {
+    name: MappingProxyType(structure) for name, structure in _PHASE_STRUCTURES.items()
+}
+
+_VALID_TYPES = frozenset(PHASE_STRUCTURES)
+
 
 def get_project_type_from_context(project_root: Path) -> str:
     """Get project type from CODEBASE_CONTEXT.json if available."""
     context_json = project_root / ".sam" / "CODEBASE_CONTEXT.json"
-    if context_json.exists():
-        try:
-            data = json.loads(context_json.read_text())
-            return data.get("project_type", "unknown")
-        except (json.JSONDecodeError, KeyError):
-            pass
-    return "unknown"
+    try:
+        raw = context_json.read_bytes()
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        return data.get("project_type", "unknown")
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return "unknown"
 
 
 def classify_manually(feature_dir: Path) -> Optional[str]:
@@ -105,21 +115,33 @@ def classify_manually(feature_dir: Path) -> Optional[str]:
     Checks FEATURE_DOCUMENTATION.md for user-specified project type.
     """
     feat_doc = feature_dir / "FEATURE_DOCUMENTATION.md"
-    if feat_doc.exists():
+    try:
         content = feat_doc.read_text()
-        # Look for project_type in metadata section
-        for line in content.split('\n'):
-            if 'project_type:' in line.lower():
-                # Extract the value after the colon
-                value = line.split(':', 1)[1].strip().lower()
-                # Validate against known types
-                if value in PHASE_STRUCTURES:
-                    return value
+    except FileNotFoundError:
+        return None
+
+    # Look for project_type in metadata section
+    for match in _PROJECT_TYPE_RE.finditer(content):
+        value = match.group(1).lower()
+        # Validate against known types
+        if value in _VALID_TYPES:
+            return value
     return None
 
 
-def update_tasks_json(feature_dir: Path, project_type: str) -> bool:
-    """Update TASKS.json with project type metadata."""
+def update_tasks_json(
+    feature_dir: Path,
+    project_type: str,
+    config: Optional[Mapping[str, Any]] = None,
+) -> bool:
+    """
+    Update TASKS.json with project type metadata.
+
+    Args:
+        feature_dir: Feature directory containing TASKS.json
+        project_type: Classified project type
+        config: Phase structure for project_type (looked up if not given)
+    """
     tasks_file = feature_dir / "TASKS.json"
 
     # Create TASKS.json if it doesn't exist
@@ -138,8 +160,10 @@ def update_tasks_json(feature_dir: Path, project_type: str) -> bool:
         }
     else:
         try:
-            with open(tasks_file, 'r') as f:
-                data: Dict[str, Any] = cast(Dict[str, Any], json.load(f))
+            if ORJSON_AVAILABLE:
+                data: Dict[str, Any] = cast(Dict[str, Any], orjson.loads(tasks_file.read_bytes()))
+            else:
+                data = cast(Dict[str, Any], json.loads(tasks_file.read_text()))
         except json.JSONDecodeError:
             print(f"Error: Failed to parse {tasks_file}")
             return False
@@ -148,23 +172,38 @@ def update_tasks_json(feature_dir: Path, project_type: str) -> bool:
     data.setdefault("metadata", {})["project_type"] = project_type
 
     # Add phase structure configuration
-    if project_type in PHASE_STRUCTURES:
-        data["metadata"]["phase_structure"] = PHASE_STRUCTURES[project_type]
-
-    # Write back
-    with open(tasks_file, 'w') as f:
-        json.dump(data, f, indent=2)
+    if config is None:
+        config = PHASE_STRUCTURES.get(project_type)
+    if config is not None:
+        data["metadata"]["phase_structure"] = dict(config)
+
+    # Write back as indented UTF-8 in a single write
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode('utf-8')
+    tasks_file.write_bytes(payload)
 
     return True
 
 
-def print_classification_summary(project_type: str):
-    """Print summary of the classification."""
-    if project_type not in PHASE_STRUCTURES:
+def print_classification_summary(
+    project_type: str,
+    config: Optional[Mapping[str, Any]] = None,
+):
+    """
+    Print summary of the classification.
+
+    Args:
+        project_type: Classified project type
+        config: Phase structure for project_type (looked up if not given)
+    """
+    if config is None:
+        config = PHASE_STRUCTURES.get(project_type)
+    if config is None:
         print(f"⚠️  Unknown project type: {project_type}")
         return
 
-    config = PHASE_STRUCTURES[project_type]
     print(f"\n📋 Project Type: {project_type}")
     print(f"   Phases: {len(config['phases'])}")
 
@@ -202,19 +241,24 @@ def main():
         print(f"✓ Using manual classification from FEATURE_DOCUMENTATION.md")
         project_type = manual_type
     else:
-        # Step 2: Run codebase analysis
+        # Step 2: Run codebase analysis (imported here so the manual
+        # classification path does not pay for loading the analyzer)
+        from codebase_analyzer import HybridCodebaseAnalyzer
+
         print("✓ Running codebase analysis...")
         analyzer = HybridCodebaseAnalyzer(project_root)
         context = analyzer.analyze()
         project_type = context.project_type
 
-    # Step 3: Update TASKS.json
+    # Step 3: Update TASKS.json (the phase structure is looked up once and
+    # shared with the summary)
+    config = PHASE_STRUCTURES.get(project_type)
     print(f"✓ Updating TASKS.json with project type: {project_type}")
-    if update_tasks_json(feature_dir, project_type):
+    if update_tasks_json(feature_dir, project_type, config):
         print(f"✓ TASKS.json updated successfully")
 
         # Print summary
-        print_classification_summary(project_type)
+        print_classification_summary(project_type, config)
     else:
         print(f"✗ Failed to update TASKS.json")
         sys.exit(1)
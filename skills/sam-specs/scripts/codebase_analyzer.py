@@ -12,12 +12,27 @@ Generates CODEBASE_CONTEXT.md with:
 
 import os
 import re
+import sys
 import json
 import logging
-import subprocess
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
-from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from dataclasses import asdict, dataclass, field
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pathspec
+    PATHSPEC_AVAILABLE = True
+except ImportError:
+    PATHSPEC_AVAILABLE = False
+
+# Parses JSON straight from bytes; orjson.JSONDecodeError subclasses json's
+_json_loads: Callable[[bytes], Any] = orjson.loads if ORJSON_AVAILABLE else json.loads
 
 # Setup logging
 logging.basicConfig(
@@ -26,8 +41,209 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Section patterns for .sam/ documentation
+_STACK_PREFS_RE = re.compile(r'### Stack Preferences.*?(?=###|\n\n|$)', re.DOTALL)
+_INTEGRATIONS_RE = re.compile(r'### Integrations Required.*?(?=###|\n\n|$)', re.DOTALL)
+_TECH_STACK_RE = re.compile(r'## Technology Stack.*?(?=##|\Z)', re.DOTALL)
+
+# Python web frameworks named at the start of a requirements.txt line
+_PY_FW_RE = re.compile(r'^\s*(django|fastapi|flask)\b', re.IGNORECASE | re.MULTILINE)
+_PY_FW_NAMES = (("django", "Django"), ("fastapi", "FastAPI"), ("flask", "Flask"))
+
+# Directories whose entry names _detect_patterns needs, recorded during the
+# source scan so they are not listed a second time
+_PATTERN_DIRS = frozenset({
+    "src", "app", "src/hooks", "src/services", "app/hooks", "app/services",
+})
+
+# React hook modules such as useAuth.ts; group 1 is the hook name
+_HOOK_FILE_RE = re.compile(r'(use.*)\.ts')
+
+# Persisted analysis, stored as a file (not a directory) so it is never
+# mistaken for a feature
+_CACHE_FILENAME = ".codebase_context_cache.json"
+_CACHE_VERSION = 1
+
+# Root files whose contents feed tech stack detection, classification and the source scan
+_MANIFEST_FILES = (
+    "package.json", "requirements.txt", "go.mod", "Gemfile", "next.config.js", ".gitignore",
+)
+
+# Buffer size for streaming the markdown report to disk
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Thread pool size for listing source directories
+_SCAN_WORKERS = 8
+
+# `output: 'export'` in next.config.js, with either quote style and any spacing
+_NEXT_STATIC_RE = re.compile(rb'output\s*:\s*["\']export["\']')
+
+# Directories never descended into when scanning source trees
+_SKIP_DIRS = frozenset({
+    'node_modules', '.git', 'dist', 'build', 'target', '.next', '.venv', 'venv',
+    '__pycache__', '.pytest_cache', 'coverage', '.turbo',
+})
+
+# Source file extensions (without the dot) tracked as components
+_CODE_EXTS = frozenset({'tsx', 'jsx', 'ts', 'js', 'py', 'go'})
+
+# package.json dependency -> tech stack layer detectors, in ascending priority:
+# when several dependencies map to the same layer, the one listed last wins.
+# A trailing "*" matches any dependency name starting with the rest.
+_DEP_DETECTORS: Tuple[Tuple[str, str, str], ...] = (
+    ("svelte", "framework", "Svelte"),
+    ("vue", "framework", "Vue"),
+    ("react", "framework", "React"),
+    ("next", "framework", "Next.js"),
+    ("prisma", "orm", "Prisma"),
+    ("drizzle-orm", "orm", "Drizzle ORM"),
+    ("@supabase/supabase-js", "database", "Supabase"),
+    ("mongoose", "database", "MongoDB (Mongoose)"),
+    ("@supabase/supabase-js", "baas", "Supabase"),
+    ("@supabase/postgrest-js", "baas", "Supabase"),
+    ("firebase", "baas", "Firebase"),
+    ("@firebase/app", "baas", "Firebase"),
+    ("@aws-amplify/core", "baas", "AWS Amplify"),
+    ("aws-amplify", "baas", "AWS Amplify"),
+    ("next-auth", "auth", "NextAuth.js"),
+    ("@auth/core", "auth", "NextAuth.js"),
+    ("zustand", "state", "Zustand"),
+    ("@reduxjs/toolkit", "state", "Redux Toolkit"),
+    ("radix-ui", "ui", "Radix UI"),
+    ("@radix-ui/react-*", "ui", "Radix UI"),
+    ("@mui/material", "ui", "Material-UI"),
+    ("@chakra-ui/react", "ui", "Chakra UI"),
+    ("express", "backend", "Express"),
+    ("fastify", "backend", "Fastify"),
+    ("nestjs", "backend", "NestJS"),
+    ("@nestjs/common", "backend", "NestJS"),
+    ("@remix-run/node", "backend", "Remix"),
+    ("@remix-run/server-runtime", "backend", "Remix"),
+)
+
+# Layers in the order they are reported
+_DEP_LAYERS: Tuple[str, ...] = tuple(dict.fromkeys(layer for _, layer, _ in _DEP_DETECTORS))
+
+
+def _build_dep_tables() -> Tuple[
+    Dict[str, Tuple[Tuple[int, str, str], ...]],
+    Tuple[Tuple[str, Tuple[int, str, str]], ...],
+]:
+    """
+    Split _DEP_DETECTORS into exact and prefix lookups.
+
+    Returns:
+        Tuple of (dependency name -> (priority, layer, name) entries,
+        (prefix, (priority, layer, name)) pairs)
+    """
+    table: Dict[str, Tuple[Tuple[int, str, str], ...]] = {}
+    prefixes: List[Tuple[str, Tuple[int, str, str]]] = []
+    for priority, (dep, layer, name) in enumerate(_DEP_DETECTORS):
+        if dep.endswith("*"):
+            prefixes.append((dep[:-1], (priority, layer, name)))
+        else:
+            table[dep] = table.get(dep, ()) + ((priority, layer, name),)
+    return table, tuple(prefixes)
+
+
+_DEP_TABLE, _DEP_PREFIXES = _build_dep_tables()
+
+# Lowercased tech stack values that indicate a custom backend. JS backends are
+# only ever stored under "backend" and Python ones under "framework".
+_BACKEND_LAYERS = ("backend", "framework")
+_BACKEND_FRAMEWORKS = frozenset({
+    "express", "fastify", "nestjs", "remix", "django", "fastapi", "flask",
+})
+
+
+def _list_dir_names(path: Path) -> Optional[List[str]]:
+    """Return the entry names in a directory, or None if it does not exist."""
+    try:
+        with os.scandir(path) as it:
+            return [entry.name for entry in it]
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
 
-@dataclass
+def _is_static_export_config(config_content: bytes) -> bool:
+    """Check next.config.js source for a static export output setting."""
+    return _NEXT_STATIC_RE.search(config_content) is not None
+
+
+class _DirScan:
+    """Result of listing a single source directory."""
+
+    __slots__ = ("path", "category", "files", "files_pos", "subdirs", "names", "stat")
+
+    def __init__(self, path: str, category: str):
+        self.path = path
+        self.category = category
+        self.files: List[str] = []
+        # Number of subdirectories listed before the first code file; a
+        # recursive walk creates the category at that point in the listing
+        self.files_pos = 0
+        self.subdirs: List[Tuple[str, str]] = []
+        self.names: Optional[List[str]] = None
+        # [mtime_ns, size] taken just before listing, when the cache is in use
+        self.stat: Optional[List[int]] = None
+
+
+def _build_ignore_matcher(raw: bytes) -> Optional[Callable[[str], bool]]:
+    """
+    Build a matcher for directories excluded by a .gitignore file.
+
+    Uses pathspec when it is installed. Without it only unanchored name
+    patterns such as ``vendor/`` or ``*.egg-info`` are honoured, and a file
+    with negated patterns disables pruning rather than risk skipping a
+    re-included directory.
+
+    Args:
+        raw: Contents of the project's .gitignore
+
+    Returns:
+        Function taking a directory path relative to the project root (with
+        "/" separators) and returning True if it is ignored, or None if no
+        directory can be pruned
+    """
+    lines = raw.decode('utf-8', errors='replace').splitlines()
+    if PATHSPEC_AVAILABLE:
+        spec = pathspec.PathSpec.from_lines('gitwildmatch', lines)
+        return lambda rel_dir: spec.match_file(rel_dir + "/")
+
+    import fnmatch
+
+    name_patterns = []
+    for line in lines:
+        pattern = line.strip()
+        if not pattern or pattern.startswith('#'):
+            continue
+        if pattern.startswith('!'):
+            return None
+        pattern = pattern.rstrip('/')
+        # Anchored and nested patterns need full gitignore semantics
+        if pattern and '/' not in pattern:
+            name_patterns.append(fnmatch.translate(pattern))
+
+    if not name_patterns:
+        return None
+    name_re = re.compile('|'.join(name_patterns))
+    return lambda rel_dir: name_re.match(rel_dir.rpartition('/')[2]) is not None
+
+
+def _stat_key(path: str) -> Optional[List[int]]:
+    """Return [mtime_ns, size] for a path, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep a __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class CodebaseContext:
     """Container for analyzed codebase context."""
     tech_stack: Dict[str, str] = field(default_factory=dict)
@@ -45,51 +261,45 @@ class CodebaseContext:
 
     def to_markdown(self) -> str:
         """Generate markdown report."""
-        lines = [
-            "# Codebase Context Analysis\n",
-            "## Technology Stack\n",
-            "| Layer | Technology | Notes |",
-            "|-------|-----------|-------|"
-        ]
+        return "".join(self.iter_markdown())
+
+    def iter_markdown(self) -> Iterator[str]:
+        """Yield the markdown report in pieces, so it can be streamed to a file or stdout."""
+        yield ("# Codebase Context Analysis\n\n"
+               "## Technology Stack\n\n"
+               "| Layer | Technology | Notes |\n"
+               "|-------|-----------|-------|")
         for layer, tech in self.tech_stack.items():
-            lines.append(f"| {layer} | {tech} | |")
+            yield f"\n| {layer} | {tech} | |"
 
         # Add project type classification (NEW)
-        lines.extend([
-            "\n## Project Classification\n",
-            f"**Project Type**: `{self._get_project_type()}`\n",
-            "*See `classify_project.py` for detailed classification logic.*\n"
-        ])
+        yield f"\n\n## Project Classification\n\n**Project Type**: `{self._get_project_type()}`"
+        yield "\n\n*See `classify_project.py` for detailed classification logic.*\n"
 
         if self.existing_features:
-            lines.extend([
-                "\n## Existing Features",
-                "The following features have been documented in .sam/:\n"
-            ])
+            yield ("\n\n## Existing Features\n"
+                   "The following features have been documented in .sam/:\n")
             for feature in self.existing_features:
-                lines.append(f"- `{feature}`")
+                yield f"\n- `{feature}`"
+
+        yield "\n\n## Existing Patterns"
+        for pattern in self.patterns:
+            yield f"\n{pattern}"
 
-        lines.extend([
-            "\n## Existing Patterns",
-            *self.patterns,
-            "\n## Reusable Components",
-        ])
+        yield "\n\n## Reusable Components"
         for category, items in self.components.items():
-            lines.append(f"\n### {category}")
-            lines.extend(f"- `{item}`" for item in items)
+            yield f"\n\n### {category}"
+            for item in items:
+                yield f"\n- `{item}`"
 
         if self.services:
-            lines.extend([
-                "\n## Services",
-                *[f"- `{service}`" for service in self.services]
-            ])
-
-        lines.extend([
-            "\n## Architecture Notes",
-            *self.architecture_notes
-        ])
+            yield "\n\n## Services"
+            for service in self.services:
+                yield f"\n- `{service}`"
 
-        return "\n".join(lines)
+        yield "\n\n## Architecture Notes"
+        for note in self.architecture_notes:
+            yield f"\n{note}"
 
 
 class HybridCodebaseAnalyzer:
@@ -103,10 +313,47 @@ class HybridCodebaseAnalyzer:
         self.project_root = project_root or Path.cwd()
         self.sam_dir = self.project_root / ".sam"
         self.context = CodebaseContext()
+        # path -> ((mtime_ns, size), parsed content) for project manifest files
+        self._file_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        # Memoized has_custom_backend() result, reset whenever analyze() runs
+        self._has_custom_backend: Optional[bool] = None
+        # Entry names of _PATTERN_DIRS seen by the last source scan, keyed by relative path
+        self._dir_listings: Dict[str, List[str]] = {}
+        # Entry names directly under project_root, listed once per analyze()
+        self._root_names: Optional[Set[str]] = None
+        # Directory matcher built from the root .gitignore, set per source scan
+        self._ignore_matcher: Optional[Callable[[str], bool]] = None
+        # Every directory the last source scan listed, for cache validation
+        self._scanned_dirs: List[str] = []
+        # path -> [mtime_ns, size] (None if missing) of each analysis input,
+        # taken when it was read; only collected while analyze() uses the cache
+        self._input_stats: Optional[Dict[str, Optional[List[int]]]] = None
+
+    def analyze(self, use_cache: bool = False) -> CodebaseContext:
+        """
+        Run full hybrid analysis.
+
+        Args:
+            use_cache: Reuse the context saved in .sam/.codebase_context_cache.json
+                by a previous run when none of the files or directories it was
+                built from changed, and save the new context there. Off by
+                default for library callers; the CLI enables it unless
+                --no-cache is given
 
-    def analyze(self) -> CodebaseContext:
-        """Run full hybrid analysis."""
+        Returns:
+            Analyzed codebase context
+        """
         logger.info("Starting hybrid codebase analysis...")
+        self._has_custom_backend = None
+        self._root_names = None
+        self._input_stats = {} if use_cache else None
+
+        if use_cache and self._load_cached_context():
+            logger.info(
+                "Codebase unchanged, reusing cached analysis "
+                f"(project type: {self.context.project_type})"
+            )
+            return self.context
 
         # Step 1: Analyze existing SAM documentation
         self._analyze_sam_docs()
@@ -121,33 +368,131 @@ class HybridCodebaseAnalyzer:
         self.context.project_type = self.classify_project_type()
 
         logger.info(f"Codebase analysis complete (project type: {self.context.project_type})")
+        if use_cache:
+            self._save_cached_context()
         return self.context
 
+    def _cache_path(self) -> Path:
+        """Location of the persisted analysis cache."""
+        return self.sam_dir / _CACHE_FILENAME
+
+    def _cache_inputs(self) -> Dict[str, Optional[List[int]]]:
+        """
+        Signature of everything the current context was derived from.
+
+        Components only depend on file names, so each scanned directory's
+        mtime stands in for its entries; manifests and feature docs are
+        tracked individually. Inputs use the stat recorded when they were
+        read, so one edited mid-scan no longer matches on the next run;
+        paths that were never read are stat'ed now.
+
+        Returns:
+            Mapping of path -> [mtime_ns, size], or None for missing paths
+        """
+        paths = [str(self.project_root), *self._scanned_dirs]
+        paths.extend(str(self.project_root / name) for name in _MANIFEST_FILES)
+        # _detect_patterns lists these directly when the scan did not (e.g. a
+        # symlinked hooks directory); os.stat follows the link to the target
+        paths.extend(str(self.project_root / name) for name in sorted(_PATTERN_DIRS))
+        for feature_id in self.context.existing_features:
+            feature_dir = self.sam_dir / feature_id
+            paths.append(str(feature_dir))
+            paths.append(str(feature_dir / "FEATURE_DOCUMENTATION.md"))
+            paths.append(str(feature_dir / "TECHNICAL_SPEC.md"))
+        stats = self._input_stats or {}
+        return {path: stats[path] if path in stats else _stat_key(path) for path in paths}
+
+    def _record_input(self, path: Path) -> None:
+        """Stat an analysis input just before it is read, if the cache is in use."""
+        stats = self._input_stats
+        if stats is not None:
+            key = str(path)
+            if key not in stats:
+                stats[key] = _stat_key(key)
+
+    def _load_cached_context(self) -> bool:
+        """
+        Restore the context from the on-disk cache if it is still valid.
+
+        Returns:
+            True if the cached context was loaded
+        """
+        try:
+            cached = _json_loads(self._cache_path().read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        if not isinstance(cached, dict) or cached.get("version") != _CACHE_VERSION:
+            return False
+
+        # Anything of the wrong shape (hand edits, older field sets) means a rescan
+        try:
+            # .sam/ itself is rewritten on every run, so compare its feature list instead
+            if cached["context"]["existing_features"] != (self._list_feature_names() or []):
+                return False
+            if any(_stat_key(path) != key for path, key in cached["inputs"].items()):
+                return False
+            context = CodebaseContext(**cached["context"])
+            scanned_dirs = list(cached["scanned_dirs"])
+        except (KeyError, TypeError, AttributeError):
+            return False
+
+        self.context = context
+        self._scanned_dirs = scanned_dirs
+        return True
+
+    def _save_cached_context(self):
+        """Persist the context and its input signature; skipped when .sam/ does not exist."""
+        if not self.sam_dir.is_dir():
+            return
+
+        payload = {
+            "version": _CACHE_VERSION,
+            "inputs": self._cache_inputs(),
+            "scanned_dirs": self._scanned_dirs,
+            "context": asdict(self.context),
+        }
+        try:
+            _write_atomic(self._cache_path(), json.dumps(payload))
+        except OSError as e:
+            logger.warning(f"Failed to write analysis cache: {e}")
+
     def _analyze_sam_docs(self):
         """Step 1: Analyze existing SAM documentation."""
-        if not self.sam_dir.exists():
+        feature_names = self._list_feature_names()
+        if feature_names is None:
             logger.info("No .sam/ directory found - no existing features documented")
             return
 
         logger.info("Analyzing .sam/ documentation...")
 
-        # Scan all feature directories
-        for feature_dir in sorted(self.sam_dir.glob("*/")):
-            if not feature_dir.is_dir():
-                continue
-
-            feature_id = feature_dir.name
+        for feature_id in feature_names:
+            feature_dir = self.sam_dir / feature_id
             self.context.existing_features.append(feature_id)
 
+            # One listing per feature answers both document checks
+            self._record_input(feature_dir)
+            doc_names = set(_list_dir_names(feature_dir) or ())
+
             # Read feature documentation
-            feat_doc = feature_dir / "FEATURE_DOCUMENTATION.md"
-            if feat_doc.exists():
-                self._extract_from_feature_doc(feat_doc)
+            if "FEATURE_DOCUMENTATION.md" in doc_names:
+                doc_path = feature_dir / "FEATURE_DOCUMENTATION.md"
+                self._record_input(doc_path)
+                self._extract_from_feature_doc(doc_path)
 
             # Read technical specs
-            tech_spec = feature_dir / "TECHNICAL_SPEC.md"
-            if tech_spec.exists():
-                self._extract_from_tech_spec(tech_spec)
+            if "TECHNICAL_SPEC.md" in doc_names:
+                spec_path = feature_dir / "TECHNICAL_SPEC.md"
+                self._record_input(spec_path)
+                self._extract_from_tech_spec(spec_path)
+
+    def _list_feature_names(self) -> Optional[List[str]]:
+        """Sorted feature directory names in .sam/, or None if it does not exist."""
+        try:
+            # scandir's cached d_type avoids a stat per entry
+            with os.scandir(self.sam_dir) as it:
+                return sorted(entry.name for entry in it if entry.is_dir())
+        except FileNotFoundError:
+            return None
 
     def _analyze_codebase(self):
         """Step 2: Scan actual codebase."""
@@ -170,160 +515,311 @@ class HybridCodebaseAnalyzer:
 
     def _detect_tech_stack(self):
         """Detect technology stack from package files."""
+        # Collect locally and publish once at the end
+        stack: Dict[str, str] = {}
+
+        root_names = self._project_root_names()
+
         # Check package.json (JavaScript/TypeScript)
         pkg_json = self.project_root / "package.json"
-        if pkg_json.exists():
-            try:
-                data = json.loads(pkg_json.read_text())
-                deps = data.get("dependencies", {})
-                dev_deps = data.get("devDependencies", {})
-
-                all_deps = {**deps, **dev_deps}
-
-                # Detect framework
-                if "next" in all_deps:
-                    version = all_deps.get("next", "")
-                    self.context.tech_stack["framework"] = f"Next.js {version}"
-                elif "react" in all_deps:
-                    version = all_deps.get("react", "")
-                    self.context.tech_stack["framework"] = f"React {version}"
-                elif "vue" in all_deps:
-                    version = all_deps.get("vue", "")
-                    self.context.tech_stack["framework"] = f"Vue {version}"
-                elif "svelte" in all_deps:
-                    version = all_deps.get("svelte", "")
-                    self.context.tech_stack["framework"] = f"Svelte {version}"
-
-                # Detect database/ORM
-                if "prisma" in all_deps:
-                    self.context.tech_stack["orm"] = "Prisma"
-                if "drizzle-orm" in all_deps:
-                    self.context.tech_stack["orm"] = "Drizzle ORM"
-                if "@supabase/supabase-js" in all_deps:
-                    self.context.tech_stack["database"] = "Supabase"
-                if "mongoose" in all_deps:
-                    self.context.tech_stack["database"] = "MongoDB (Mongoose)"
-
-                # Detect BaaS providers (NEW)
-                if "@supabase/supabase-js" in all_deps or "@supabase/postgrest-js" in all_deps:
-                    self.context.tech_stack["baas"] = "Supabase"
-                if "firebase" in all_deps or "@firebase/app" in all_deps:
-                    self.context.tech_stack["baas"] = "Firebase"
-                if "@aws-amplify/core" in all_deps or "aws-amplify" in all_deps:
-                    self.context.tech_stack["baas"] = "AWS Amplify"
-
-                # Detect auth
-                if "next-auth" in all_deps or "@auth/core" in all_deps:
-                    self.context.tech_stack["auth"] = "NextAuth.js"
-
-                # Detect state management
-                if "zustand" in all_deps:
-                    self.context.tech_stack["state"] = "Zustand"
-                if "@reduxjs/toolkit" in all_deps:
-                    self.context.tech_stack["state"] = "Redux Toolkit"
-
-                # Detect UI library
-                if "@radix-ui/react-*" in str(all_deps) or "radix-ui" in str(all_deps):
-                    self.context.tech_stack["ui"] = "Radix UI"
-                if "@mui/material" in all_deps:
-                    self.context.tech_stack["ui"] = "Material-UI"
-                if "@chakra-ui/react" in all_deps:
-                    self.context.tech_stack["ui"] = "Chakra UI"
-
-                # Detect backend frameworks
-                if "express" in all_deps:
-                    self.context.tech_stack["backend"] = "Express"
-                if "fastify" in all_deps:
-                    self.context.tech_stack["backend"] = "Fastify"
-                if "nestjs" in all_deps or "@nestjs/common" in all_deps:
-                    self.context.tech_stack["backend"] = "NestJS"
-                if "@remix-run/node" in all_deps or "@remix-run/server-runtime" in all_deps:
-                    self.context.tech_stack["backend"] = "Remix"
-
-            except json.JSONDecodeError:
-                logger.warning("Failed to parse package.json")
+        try:
+            data = (
+                self._read_cached(pkg_json, _json_loads)
+                if "package.json" in root_names else None
+            )
+        except json.JSONDecodeError:
+            logger.warning("Failed to parse package.json")
+            data = None
+
+        if data is not None:
+            deps = data.get("dependencies", {})
+            dev_deps = data.get("devDependencies", {})
+
+            # Probe the detector table against the dependency maps rather than
+            # walking every dependency: the table is usually the smaller side.
+            # devDependencies win on duplicates, as they did when the maps were merged.
+            detected: Dict[str, Tuple[int, str, str]] = {}
+            for dep, hits in _DEP_TABLE.items():
+                if dep in dev_deps:
+                    version = dev_deps[dep]
+                elif dep in deps:
+                    version = deps[dep]
+                else:
+                    continue
+                for priority, layer, name in hits:
+                    if layer not in detected or priority > detected[layer][0]:
+                        detected[layer] = (priority, name, version)
+
+            # Prefix detectors need a scan, so only run one that could still win
+            for prefix, (priority, layer, name) in _DEP_PREFIXES:
+                if layer in detected and detected[layer][0] > priority:
+                    continue
+                for dep_map in (dev_deps, deps):
+                    match = next((dep for dep in dep_map if dep.startswith(prefix)), None)
+                    if match is not None:
+                        detected[layer] = (priority, name, dep_map[match])
+                        break
+
+            for layer in _DEP_LAYERS:
+                if layer in detected:
+                    _, name, version = detected[layer]
+                    if layer == "framework":
+                        name = f"{name} {version}"
+                    stack[layer] = name
 
         # Check for Python
-        if (self.project_root / "requirements.txt").exists():
-            self.context.tech_stack["language"] = "Python"
-            # Try to detect framework
-            reqs = (self.project_root / "requirements.txt").read_text()
-            if "django" in reqs.lower():
-                self.context.tech_stack["framework"] = "Django"
-            elif "fastapi" in reqs.lower():
-                self.context.tech_stack["framework"] = "FastAPI"
-            elif "flask" in reqs.lower():
-                self.context.tech_stack["framework"] = "Flask"
+        reqs = None
+        if "requirements.txt" in root_names:
+            reqs = self._read_cached(self.project_root / "requirements.txt")
+        if reqs is not None:
+            stack["language"] = "Python"
+            # Try to detect framework (Django, then FastAPI, then Flask)
+            found = {name.lower() for name in _PY_FW_RE.findall(reqs)}
+            for key, name in _PY_FW_NAMES:
+                if key in found:
+                    stack["framework"] = name
+                    break
 
         # Check for Go
-        if (self.project_root / "go.mod").exists():
-            self.context.tech_stack["language"] = "Go"
+        if "go.mod" in root_names:
+            stack["language"] = "Go"
 
         # Check for Ruby
-        if (self.project_root / "Gemfile").exists():
-            self.context.tech_stack["language"] = "Ruby"
+        if "Gemfile" in root_names:
+            stack["language"] = "Ruby"
+
+        self.context.tech_stack.update(stack)
+
+    def _project_root_names(self) -> Set[str]:
+        """
+        Entry names directly under the project root.
+
+        One directory listing answers every manifest and source directory
+        probe, instead of a separate stat for each candidate path.
+        """
+        if self._root_names is None:
+            self._record_input(self.project_root)
+            self._root_names = set(_list_dir_names(self.project_root) or ())
+        return self._root_names
+
+    def _read_cached(self, path: Path, parser: Optional[Callable[[bytes], Any]] = None) -> Any:
+        """
+        Read a file, optionally parsing it, and reuse the result while unchanged.
+
+        The cache is keyed on the file's mtime and size, so repeated analyze()
+        calls do not re-read or re-parse manifests that have not changed.
+
+        Args:
+            path: File to read
+            parser: Optional function applied to the raw file bytes
+
+        Returns:
+            Parsed content (decoded UTF-8 text without a parser), or None if
+            the file does not exist
+        """
+        # Open first and fstat the handle: one path lookup, and no exists() race
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            self._record_input(path)
+            return None
+
+        with f:
+            stat = os.fstat(f.fileno())
+            key = (stat.st_mtime_ns, stat.st_size)
+            if self._input_stats is not None:
+                self._input_stats.setdefault(str(path), list(key))
+            cached = self._file_cache.get(path)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            raw = f.read()
+
+        value = parser(raw) if parser else raw.decode('utf-8')
+        self._file_cache[path] = (key, value)
+        return value
 
     def _scan_source_structure(self):
-        """Scan source code directory structure."""
+        """
+        Scan source code directory structure.
+
+        Every directory is listed as its own task on a thread pool, so scandir
+        calls across the whole tree overlap their I/O latency. Results are then
+        replayed in depth-first order, keeping the components mapping identical
+        to a serial walk.
+        """
         common_src_dirs = ["src", "app", "lib", "components", "frontend", "backend"]
+        root_names = self._project_root_names()
+        existing_dirs = [d for d in common_src_dirs if d in root_names]
+        self._dir_listings = {}
+        self._scanned_dirs = []
+        if not existing_dirs:
+            return
+
+        # Prune .gitignore'd trees (vendored code, virtualenvs, build output),
+        # starting with the top-level source directories themselves
+        self._ignore_matcher = None
+        if ".gitignore" in root_names:
+            self._ignore_matcher = self._read_cached(
+                self.project_root / ".gitignore", _build_ignore_matcher
+            )
+        if self._ignore_matcher is not None:
+            existing_dirs = [d for d in existing_dirs if not self._ignore_matcher(d)]
+            if not existing_dirs:
+                return
+
+        # Relative paths are built as "<relative dir>/<name>", with the directory
+        # prefix computed once per directory rather than once per file
+        root_prefix = os.path.join(str(self.project_root), "")
+
+        # Deferred so runs without source directories skip the import
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        scans: Dict[str, _DirScan] = {}
+        with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as executor:
+            pending = {
+                executor.submit(self._scan_directory, str(self.project_root / d), d, root_prefix)
+                for d in existing_dirs
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    scan = future.result()
+                    scans[scan.path] = scan
+                    for child_path, child_category in scan.subdirs:
+                        pending.add(
+                            executor.submit(
+                                self._scan_directory, child_path, child_category, root_prefix
+                            )
+                        )
+
+        self._scanned_dirs = list(scans)
+        if self._input_stats is not None:
+            for path, scan in scans.items():
+                self._input_stats.setdefault(path, scan.stat)
+        components = self.context.components
+        for src_dir in existing_dirs:
+            # Holds directory paths still to visit and _DirScans whose files
+            # are due; children are pushed in reverse so they pop in listing order
+            stack: List[Any] = [str(self.project_root / src_dir)]
+            while stack:
+                item = stack.pop()
+                if isinstance(item, _DirScan):
+                    components.setdefault(item.category, []).extend(item.files)
+                    continue
+
+                scan = scans[item]
+                if scan.names is not None:
+                    self._dir_listings[scan.category] = scan.names
+                children: List[Any] = [child_path for child_path, _ in scan.subdirs]
+                if scan.files:
+                    children.insert(scan.files_pos, scan)
+                stack.extend(reversed(children))
+
+    def _scan_directory(self, dir_path: str, category: str, root_prefix: str) -> "_DirScan":
+        """
+        List one source directory for components/services.
 
-        for src_dir in common_src_dirs:
-            path = self.project_root / src_dir
-            if path.exists():
-                self._scan_directory(path, src_dir)
+        Uses os.scandir so file type checks reuse the directory entry data
+        instead of issuing a stat per entry. Symlinks are not followed.
 
-    def _scan_directory(self, path: Path, category: str):
-        """Recursively scan directory for components/services."""
+        Args:
+            dir_path: Directory to list
+            category: Category name for files directly under dir_path
+            root_prefix: Project root path with a trailing separator
+
+        Returns:
+            _DirScan with the directory's code files and subdirectories to visit
+        """
+        scan = _DirScan(dir_path, category)
+        if self._input_stats is not None:
+            scan.stat = _stat_key(dir_path)
         try:
-            for item in path.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    # Skip node_modules and similar
-                    if item.name in ['node_modules', '.git', 'dist', 'build', 'target']:
+            entries = os.scandir(dir_path)
+        except (PermissionError, NotADirectoryError):
+            return scan
+
+        if dir_path.startswith(root_prefix):
+            rel_dir = os.path.join(dir_path[len(root_prefix):], "")
+        else:
+            rel_dir = os.path.join(os.path.relpath(dir_path, self.project_root), "")
+        files = scan.files
+        names = scan.names = [] if category in _PATTERN_DIRS else None
+        ignored = self._ignore_matcher
+        rel_dir_posix = rel_dir.replace(os.sep, "/") if ignored is not None else ""
+
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if names is not None:
+                    names.append(name)
+                if entry.is_dir(follow_symlinks=False):
+                    # Prune hidden and ignored directories before descending
+                    if name in _SKIP_DIRS or name.startswith('.'):
+                        continue
+                    if ignored is not None and ignored(rel_dir_posix + name):
                         continue
-                    self._scan_directory(item, f"{category}/{item.name}")
-                elif item.is_file():
-                    # Track files by category
-                    ext = item.suffix
-                    if ext in ['.tsx', '.jsx', '.ts', '.js', '.py', '.go']:
-                        rel_path = item.relative_to(self.project_root)
-                        if category not in self.context.components:
-                            self.context.components[category] = []
-                        self.context.components[category].append(str(rel_path))
-        except PermissionError:
-            pass
+                    # One interned category per directory, shared by all of its files
+                    scan.subdirs.append((entry.path, sys.intern(f"{category}/{name}")))
+                elif entry.is_file(follow_symlinks=False):
+                    # Track files by category (dots-only stems are dotfiles, as with splitext)
+                    stem, _, ext = name.rpartition('.')
+                    if ext in _CODE_EXTS and stem.lstrip('.'):
+                        if not files:
+                            scan.files_pos = len(scan.subdirs)
+                        files.append(rel_dir + name)
+        return scan
 
     def _detect_patterns(self):
         """Detect coding patterns from source code."""
         # Look for common patterns
         # This is a simplified implementation
 
-        src_dirs = [d for d in [self.project_root / "src", self.project_root / "app"] if d.exists()]
+        for src_name in ("src", "app"):
+            child_names = self._list_project_dir(src_name)
+            if child_names is None:
+                continue
+            children = set(child_names)
 
-        for src_dir in src_dirs:
             # Look for hooks pattern (React)
-            hooks_dir = src_dir / "hooks"
-            if hooks_dir.exists():
+            hook_names = None
+            if "hooks" in children:
+                hook_names = self._list_project_dir(f"{src_name}/hooks")
+            if hook_names is not None:
                 self.context.patterns.append("Uses custom hooks directory: `src/hooks/`")
-                for hook in hooks_dir.glob("use*.ts"):
-                    self.context.components.setdefault("hooks", []).append(f"use{hook.stem}")
+                for name in hook_names:
+                    hook_match = _HOOK_FILE_RE.fullmatch(name)
+                    if hook_match:
+                        self.context.components.setdefault("hooks", []).append(hook_match.group(1))
 
             # Look for services/api pattern
-            services_dir = src_dir / "services"
-            if services_dir.exists():
+            service_names = None
+            if "services" in children:
+                service_names = self._list_project_dir(f"{src_name}/services")
+            if service_names is not None:
                 self.context.patterns.append("Uses services layer: `src/services/`")
-                for service in services_dir.glob("*.ts"):
-                    self.context.services.append(service.stem)
+                for name in service_names:
+                    # Same matches and stems as the glob("*.ts") this replaced,
+                    # which includes dotfiles such as .draft.ts
+                    if name.endswith(".ts"):
+                        self.context.services.append(Path(name).stem)
 
             # Look for components pattern
-            components_dir = src_dir / "components"
-            if components_dir.exists():
+            if "components" in children:
                 self.context.patterns.append("Uses component directory: `src/components/`")
 
             # Look for lib/util pattern
-            lib_dirs = [src_dir / "lib", src_dir / "utils"]
-            for lib_dir in lib_dirs:
-                if lib_dir.exists():
-                    self.context.patterns.append(f"Uses utilities directory: `{lib_dir.relative_to(self.project_root)}/`")
+            for lib_name in ("lib", "utils"):
+                if lib_name in children:
+                    self.context.patterns.append(
+                        f"Uses utilities directory: `{Path(src_name) / lib_name}/`"
+                    )
+
+    def _list_project_dir(self, rel_path: str) -> Optional[List[str]]:
+        """Entry names of a project directory, reusing the source scan's listing if it has one."""
+        if rel_path in self._dir_listings:
+            return self._dir_listings[rel_path]
+        self._record_input(self.project_root / rel_path)
+        return _list_dir_names(self.project_root / rel_path)
 
     def _extract_from_feature_doc(self, doc_path: Path):
         """Extract context from feature documentation."""
@@ -331,13 +827,13 @@ class HybridCodebaseAnalyzer:
             content = doc_path.read_text()
 
             # Extract tech stack preferences
-            tech_section = re.search(r'### Stack Preferences.*?(?=###|\n\n|$)', content, re.DOTALL)
+            tech_section = _STACK_PREFS_RE.search(content)
             if tech_section:
                 # Parse tech preferences
                 pass
 
             # Extract integrations
-            integrations_section = re.search(r'### Integrations Required.*?(?=###|\n\n|$)', content, re.DOTALL)
+            integrations_section = _INTEGRATIONS_RE.search(content)
             if integrations_section:
                 pass
 
@@ -350,11 +846,7 @@ class HybridCodebaseAnalyzer:
             content = spec_path.read_text()
 
             # Extract technology stack table
-            stack_match = re.search(
-                r'## Technology Stack.*?(?=##|\Z)',
-                content,
-                re.DOTALL
-            )
+            stack_match = _TECH_STACK_RE.search(content)
             if stack_match:
                 # Parse tech stack from spec
                 pass
@@ -371,38 +863,25 @@ class HybridCodebaseAnalyzer:
         """
         tech = self.context.tech_stack
 
-        # Check for backend indicators
-        backend_frameworks = ["express", "fastify", "nestjs", "remix", "django", "fastapi", "flask"]
-        has_custom_backend = any(
-            fw in str(tech).lower() for fw in backend_frameworks
-        )
-
-        # Check for BaaS provider
-        has_baas = "baas" in tech
-
-        # Check for frontend framework
-        has_frontend = "framework" in tech
-
-        # Check if configured for static export
-        is_static_site = False
-        if "next.js" in str(tech).lower():
-            # Check next.config for static output
-            next_config = self.project_root / "next.config.js"
-            if next_config.exists():
-                config_content = next_config.read_text()
-                if "output: 'export'" in config_content or 'output: "export"' in config_content:
-                    is_static_site = True
-
-        # Classification logic
-        if has_baas and has_frontend:
+        # Every classification other than "unknown" requires a frontend framework
+        if "framework" not in tech:
+            return "unknown"
+
+        # Cheapest checks first; only the static export check touches disk
+        if "baas" in tech:
             return "baas-fullstack"
-        elif has_frontend and not has_custom_backend and not has_baas:
-            return "frontend-only" if not is_static_site else "static-site"
-        elif has_frontend and has_custom_backend:
+        if self.has_custom_backend():
             return "full-stack"
-        elif is_static_site:
-            return "static-site"
-        return "unknown"
+        return "static-site" if self._is_static_next_export() else "frontend-only"
+
+    def _is_static_next_export(self) -> bool:
+        """Check whether a Next.js project is configured for static export."""
+        if not self.context.tech_stack.get("framework", "").lower().startswith("next.js"):
+            return False
+
+        # Cached as a bool against next.config.js's mtime and size
+        config_file = self.project_root / "next.config.js"
+        return bool(self._read_cached(config_file, _is_static_export_config))
 
     def get_baas_provider(self) -> Optional[str]:
         """Get the detected BaaS provider name."""
@@ -410,22 +889,30 @@ class HybridCodebaseAnalyzer:
 
     def has_custom_backend(self) -> bool:
         """Check if project has a custom backend implementation."""
-        backend_frameworks = ["express", "fastify", "nestjs", "remix", "django", "fastapi", "flask"]
-        return any(
-            fw in str(self.context.tech_stack).lower()
-            for fw in backend_frameworks
-        )
+        if self._has_custom_backend is None:
+            tech = self.context.tech_stack
+            self._has_custom_backend = any(
+                tech.get(layer, "").lower() in _BACKEND_FRAMEWORKS for layer in _BACKEND_LAYERS
+            )
+        return self._has_custom_backend
 
-    def to_json(self) -> str:
+    def to_json(self, compact: bool = False) -> str:
         """
         Export context as JSON for programmatic use by sam-specs.
 
+        Args:
+            compact: Emit JSON without indentation or whitespace
+
         Returns:
             JSON string with classification data
         """
-        import json
-        return json.dumps({
-            "project_type": self.classify_project_type(),
+        # analyze() already classified the project; only classify if it has not run
+        project_type = self.context.project_type
+        if project_type == "unknown":
+            project_type = self.classify_project_type()
+
+        data = {
+            "project_type": project_type,
             "tech_stack": self.context.tech_stack,
             "baas_provider": self.get_baas_provider(),
             "has_custom_backend": self.has_custom_backend(),
@@ -433,31 +920,60 @@ class HybridCodebaseAnalyzer:
             "patterns": self.context.patterns,
             "components": self.context.components,
             "services": self.context.services
-        }, indent=2)
+        }
+
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2).decode('utf-8')
+        if compact:
+            return json.dumps(data, separators=(',', ':'))
+        return json.dumps(data, indent=2)
+
+
+def _write_atomic(path: Path, content: str):
+    """Write UTF-8 text via a temp file and rename so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(content.encode('utf-8'))
+    os.replace(tmp_path, path)
+
+
+def _write_atomic_chunks(path: Path, chunks: Iterable[str], echo: bool = False):
+    """
+    Stream UTF-8 text chunks to a file via a temp file and rename.
+
+    Args:
+        path: Destination file
+        chunks: Text pieces to write in order
+        echo: Also write each chunk to stdout
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="", buffering=_WRITE_BUFFER_SIZE) as f:
+        for chunk in chunks:
+            f.write(chunk)
+            if echo:
+                sys.stdout.write(chunk)
+    os.replace(tmp_path, path)
 
 
 def main():
     """CLI entry point."""
-    import sys
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    use_cache = "--no-cache" not in sys.argv
 
-    project_root = Path(sys.argv[1]) if len(sys.argv) > 1 else Path.cwd()
+    project_root = Path(args[0]) if args else Path.cwd()
     analyzer = HybridCodebaseAnalyzer(project_root)
-    context = analyzer.analyze()
-
-    # Output markdown
-    markdown = context.to_markdown()
-    print(markdown)
+    context = analyzer.analyze(use_cache=use_cache)
 
-    # Save markdown to file
+    # Output markdown and save it to file in one streaming pass
     output_path = project_root / ".sam" / "CODEBASE_CONTEXT.md"
     output_path.parent.mkdir(exist_ok=True)
-    output_path.write_text(markdown)
+    _write_atomic_chunks(output_path, context.iter_markdown(), echo=True)
+    print()
     print(f"\n✓ Codebase context saved to: {output_path}")
 
     # Save JSON for programmatic use (NEW)
     json_output = analyzer.to_json()
     json_path = project_root / ".sam" / "CODEBASE_CONTEXT.json"
-    json_path.write_text(json_output)
+    _write_atomic(json_path, json_output)
     print(f"✓ Codebase context JSON saved to: {json_path}")
 
 
@@ -15,12 +15,139 @@ Output:
     Resolves {{VARIABLE}} placeholders in templates
 """
 
+import os
 import sys
 import re
+import copy
+import shutil
+from collections import OrderedDict
+from fnmatch import fnmatch
+from functools import lru_cache
 import yaml
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Set, Tuple, Union
+
+# Prefer the libyaml bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+_PLACEHOLDER_RE = re.compile(r"\{\{([^}]+)\}\}")
+
+# Common optional variables with default values
+_COMMON_DEFAULTS: Dict[str, str] = {
+    "application.version": "1.0.0",
+    "application.environment": "development",
+    "database.port": "5432",
+    "database.ssl_mode": "require",
+    "api.timeout": "30000",
+    "api.rate_limit": "1000",
+    "cache.ttl": "3600",
+    "logging.level": "info",
+}
+
+# Required variables (must be provided), matched by prefix
+_REQUIRED_PREFIXES = ("application.name", "application.description")
+
+# Name-based suggestions: the first rule whose trigger substring occurs in
+# the placeholder decides; its first matching (qualifier, value) wins and
+# a rule without a matching qualifier suggests nothing
+_SUGGEST_RULES: Tuple[Tuple[Tuple[str, ...], Tuple[Tuple[Optional[str], str], ...]], ...] = (
+    (("port",), ((None, "3000"),)),
+    (("host", "url"), (("database", "localhost"), ("api", "http://localhost:3000"))),
+    (("email",), ((None, "noreply@example.com"),)),
+)
+
+# Upper bound on threads used by resolve_directory
+_RESOLVE_WORKERS = 32
+
+# Parsed CONTEXT.yaml files: path -> ((mtime_ns, size), document), least
+# recently used first. A changed file replaces its entry, and the oldest
+# entries are evicted beyond _YAML_CACHE_SIZE
+_YAML_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+_YAML_CACHE_SIZE = 32
+
+
+def _load_yaml_cached(path: Path) -> Any:
+    """
+    Parse a YAML file, reusing the previous result while it is unchanged.
+
+    Args:
+        path: YAML file path
+
+    Returns:
+        A deep copy of the parsed document, safe for the caller to mutate
+    """
+    st = path.stat()
+    key = str(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    entry = _YAML_CACHE.get(key)
+    if entry is None or entry[0] != stamp:
+        # Raw bytes: the loader detects the encoding itself
+        entry = (stamp, yaml.load(path.read_bytes(), Loader=_Loader))
+        _YAML_CACHE[key] = entry
+        if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+            _YAML_CACHE.popitem(last=False)
+    _YAML_CACHE.move_to_end(key)
+    return copy.deepcopy(entry[1])
+
+
+# Global CONTEXT.yaml locations tried in each directory, in priority order
+_CONTEXT_FILE_CANDIDATES = (Path("templates") / "CONTEXT.yaml", Path("CONTEXT.yaml"))
+
+
+@lru_cache(maxsize=128)
+def _context_file_in_resolved(directory: Path) -> Optional[Path]:
+    """
+    Return which _CONTEXT_FILE_CANDIDATES entry exists in a resolved directory.
+
+    Cached per process, so resolvers for sibling features share the stat
+    calls for their common parent directories.
+    """
+    for candidate in _CONTEXT_FILE_CANDIDATES:
+        if (directory / candidate).exists():
+            return candidate
+    return None
+
+
+def _context_file_in(directory: Path) -> Optional[Path]:
+    """
+    Return the global CONTEXT.yaml candidate present in a directory, if any.
+
+    The directory is resolved before the cached lookup, so relative paths
+    stay correct across os.chdir and every spelling of a directory shares
+    one entry. The result is joined back onto the caller's path.
+    """
+    candidate = _context_file_in_resolved(directory.resolve())
+    return directory / candidate if candidate is not None else None
+
+
+def clear_context_file_cache() -> None:
+    """
+    Forget cached global CONTEXT.yaml lookups.
+
+    Lookups (including misses) are cached for the life of the process;
+    long-lived callers that create or delete CONTEXT.yaml files should
+    call this before constructing new resolvers.
+    """
+    _context_file_in_resolved.cache_clear()
+
+
+def _suggest_default(placeholder: str) -> Optional[str]:
+    """Suggest a default value for a missing optional placeholder."""
+    if placeholder in _COMMON_DEFAULTS:
+        return _COMMON_DEFAULTS[placeholder]
+
+    # Try to suggest a value based on the variable name
+    for triggers, choices in _SUGGEST_RULES:
+        if any(trigger in placeholder for trigger in triggers):
+            for qualifier, value in choices:
+                if qualifier is None or qualifier in placeholder:
+                    return value
+            return None
+    return None
 
 
 class ContextResolver:
@@ -43,20 +170,35 @@ class ContextResolver:
         self.feature_dir = feature_dir
         self.global_context_path = global_context_path or self._find_global_context()
         self.feature_context_path = feature_context_path or (feature_dir / "CONTEXT.yaml")
-        self.context: Dict[str, Any] = {}
+        self._context: Dict[str, Any] = {}
+        self._flat_cache: Optional[Dict[str, Any]] = None
+        self._str_flat_cache: Optional[Dict[str, str]] = None
+
+    @property
+    def context(self) -> Dict[str, Any]:
+        """
+        The merged context dictionary.
+
+        Callers may mutate the returned dict directly, so reading it drops
+        the memoized flattened view. Re-read ``resolver.context`` after
+        resolving rather than mutating a reference kept from before.
+        """
+        self._invalidate_cache()
+        return self._context
+
+    @context.setter
+    def context(self, value: Dict[str, Any]) -> None:
+        self._context = value
+        self._invalidate_cache()
 
     def _find_global_context(self) -> Path:
         """Find the global context file relative to the feature directory."""
         # Try relative path from feature dir
         feature_dir = self.feature_dir
         for parent in [feature_dir] + list(feature_dir.parents):
-            candidates = [
-                parent / "templates" / "CONTEXT.yaml",
-                parent / "CONTEXT.yaml",
-            ]
-            for candidate in candidates:
-                if candidate.exists():
-                    return candidate
+            candidate = _context_file_in(parent)
+            if candidate is not None:
+                return candidate
 
         # Default to templates/CONTEXT.yaml in sam-plugin root
         return Path(__file__).parent.parent.parent.parent / "templates" / "CONTEXT.yaml"
@@ -65,17 +207,17 @@ class ContextResolver:
         """Load global and feature-specific context."""
         # Load global context
         if self.global_context_path and self.global_context_path.exists():
-            with open(self.global_context_path, 'r') as f:
-                global_data = yaml.safe_load(f)
-                if global_data:
-                    self._deep_merge(global_data)
+            global_data = _load_yaml_cached(self.global_context_path)
+            if global_data:
+                self._deep_merge(global_data)
 
         # Load feature context (overrides global)
         if self.feature_context_path.exists():
-            with open(self.feature_context_path, 'r') as f:
-                feature_data = yaml.safe_load(f)
-                if feature_data:
-                    self._deep_merge(feature_data)
+            feature_data = _load_yaml_cached(self.feature_context_path)
+            if feature_data:
+                self._deep_merge(feature_data)
+
+        self._invalidate_cache()
 
     def resolve_string(self, template: str) -> str:
         """
@@ -90,23 +232,34 @@ class ContextResolver:
         Returns:
             String with placeholders replaced by actual values
         """
-        result = template
+        if "{{" not in template:
+            return template
 
-        # Replace placeholders with flattened context
-        for key, value in self._flatten_context().items():
-            placeholder = f"{{{{{key}}}}}"
-            if placeholder in result:
-                result = result.replace(placeholder, str(value))
+        return self._resolve_with_map(template, self._stringified_context())
+
+    def _resolve_with_map(self, template: str, values: Dict[str, str]) -> str:
+        """
+        Substitute placeholders from a flat key -> string mapping.
+
+        Args:
+            template: String containing {{VARIABLE}} placeholders
+            values: Dot-notation keys mapped to replacement strings
 
-        # Replace any remaining placeholders with empty string (with warning)
-        remaining = re.findall(r'\{\{([^}]+)\}\}', result)
-        if remaining:
+        Returns:
+            String with placeholders replaced; unknown ones become empty
+        """
+        def _sub(match: "re.Match[str]") -> str:
+            key = match.group(1)
+            if key in values:
+                return values[key]
+
+            # Replace unknown placeholders with empty string (with warning)
             import warnings
-            for var in remaining:
-                warnings.warn(f"Context variable not found: {{{{var}}}}")
-                result = result.replace(f"{{{{{var}}}}}", "")
+            warnings.warn(f"Context variable not found: {{{{{key}}}}}")
+            return ""
 
-        return result
+        # Single left-to-right pass: only placeholders present are looked up
+        return _PLACEHOLDER_RE.sub(_sub, template)
 
     def resolve_file(self, input_file: Path, output_file: Path) -> None:
         """
@@ -116,16 +269,14 @@ class ContextResolver:
             input_file: Input file path
             output_file: Output file path
         """
-        with open(input_file, 'r') as f:
-            content = f.read()
+        content = input_file.read_text(encoding='utf-8')
 
         resolved = self.resolve_string(content)
 
         # Ensure output directory exists
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_file, 'w') as f:
-            f.write(resolved)
+        output_file.write_text(resolved, encoding='utf-8')
 
     def export_context(self, output_file: Path, format: str = "yaml") -> None:
         """
@@ -137,12 +288,14 @@ class ContextResolver:
         """
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
+        # Serialize in memory and write once; dumping straight into a text
+        # file issues many small writes
         if format == "json":
-            with open(output_file, 'w') as f:
-                json.dump(self.context, f, indent=2)
+            output_file.write_text(json.dumps(self._context, indent=2), encoding='utf-8')
         else:  # yaml
-            with open(output_file, 'w') as f:
-                yaml.dump(self.context, f, default_flow_style=False)
+            output_file.write_bytes(
+                yaml.dump(self._context, Dumper=_Dumper, default_flow_style=False, encoding='utf-8')
+            )
 
     def get_value(self, path: str, default: Any = None) -> Any:
         """
@@ -155,8 +308,14 @@ class ContextResolver:
         Returns:
             Value at path or default
         """
+        # Leaves are a single lookup once the flattened view exists;
+        # intermediate mappings are not stored there and fall back to the walk
+        flat = self._flat_cache
+        if flat is not None and path in flat:
+            return flat[path]
+
         keys = path.split('.')
-        value = self.context
+        value = self._context
 
         for key in keys:
             if isinstance(value, dict) and key in value:
@@ -175,7 +334,7 @@ class ContextResolver:
             value: Value to set
         """
         keys = path.split('.')
-        context = self.context
+        context = self._context
 
         for key in keys[:-1]:
             if key not in context:
@@ -184,27 +343,73 @@ class ContextResolver:
 
         context[keys[-1]] = value
 
+        # Overwriting an existing leaf with another leaf keeps the flattened
+        # views valid, so update them in place instead of rebuilding them
+        flat = self._flat_cache
+        if flat is not None and path in flat and not isinstance(value, dict):
+            flat[path] = value
+            if self._str_flat_cache is not None:
+                self._str_flat_cache[path] = str(value)
+        else:
+            self._invalidate_cache()
+
+    def _invalidate_cache(self) -> None:
+        """Drop the memoized flattened context after ``self.context`` changes."""
+        self._flat_cache = None
+        self._str_flat_cache = None
+
+    def _stringified_context(self) -> Dict[str, str]:
+        """
+        Flattened context with every value already converted to str.
+
+        Memoized alongside _flatten_context so substitutions do not call
+        str() on the same list or number for every occurrence.
+
+        Returns:
+            Flattened dictionary of dot-notation keys to string values
+        """
+        if self._str_flat_cache is None:
+            self._str_flat_cache = {
+                key: str(value) for key, value in self._flatten_context().items()
+            }
+        return self._str_flat_cache
+
     def _flatten_context(self, prefix: str = "") -> Dict[str, Any]:
         """
         Flatten nested context to dot-notation keys.
 
+        The unprefixed result is memoized until the context is modified via
+        load_context, set_value or _deep_merge (set_value updates an existing
+        leaf in place) or handed out through the context property; callers
+        must not mutate it.
+
         Args:
-            prefix: Current prefix for recursive calls
+            prefix: Prefix prepended to every flattened key
 
         Returns:
             Flattened dictionary with dot-notation keys
         """
+        if not prefix and self._flat_cache is not None:
+            return self._flat_cache
+
         flat = {}
 
-        def _flatten(obj: Any, prefix: str) -> None:
+        # Explicit stack instead of recursion; children are pushed in reverse
+        # so leaves come out in the same depth-first order as before. Keys are
+        # always str, including top-level YAML keys such as 404: or 2024:
+        stack = [(prefix, self._context)]
+        while stack:
+            key_prefix, obj = stack.pop()
             if isinstance(obj, dict):
-                for key, value in obj.items():
-                    new_key = f"{prefix}.{key}" if prefix else key
-                    _flatten(value, new_key)
+                stack.extend(
+                    (f"{key_prefix}.{key}" if key_prefix else str(key), value)
+                    for key, value in reversed(obj.items())
+                )
             else:
-                flat[prefix] = obj
+                flat[key_prefix] = obj
 
-        _flatten(self.context, prefix)
+        if not prefix:
+            self._flat_cache = flat
         return flat
 
     def _deep_merge(self, new_data: Dict[str, Any]) -> None:
@@ -222,7 +427,8 @@ class ContextResolver:
                     base[key] = value
             return base
 
-        self.context = _merge(self.context, new_data)
+        self._context = _merge(self._context, new_data)
+        self._invalidate_cache()
 
     def validate_context(self) -> List[str]:
         """
@@ -236,7 +442,7 @@ class ContextResolver:
         # Check for required top-level keys
         required_keys = ['application']
         for key in required_keys:
-            if key not in self.context:
+            if key not in self._context:
                 errors.append(f"Missing required context key: {key}")
 
         # Check for placeholder values (strings starting with {{)
@@ -271,65 +477,41 @@ class ContextResolver:
             }
         """
         if context is None:
-            context = self.context
+            context = self._context
 
         # Extract all placeholders from content
         placeholders = self.get_template_variables(content)
 
-        # Flatten context for lookup
-        flat_context = self._flatten_context()
-
-        # Common optional variables with default values
-        COMMON_DEFAULTS = {
-            "application.version": "1.0.0",
-            "application.environment": "development",
-            "database.port": "5432",
-            "database.ssl_mode": "require",
-            "api.timeout": "30000",
-            "api.rate_limit": "1000",
-            "cache.ttl": "3600",
-            "logging.level": "info",
-        }
+        # Flatten context for lookup (not needed for untemplated content)
+        flat_context = self._flatten_context() if placeholders else {}
 
-        # Required variables (must be provided)
-        required_patterns = ["application.name", "application.description"]
+        return self._placeholder_report(set(placeholders), flat_context)
 
-        # Validation results
-        missing_required = []
-        missing_optional = []
-        warnings = []
-        suggestions = {}
+    def _placeholder_report(self, placeholders: Set[str], known: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the validate_placeholders result for a set of placeholder names.
 
-        for placeholder in placeholders:
-            if placeholder in flat_context:
-                # Placeholder exists in context
-                continue
+        Args:
+            placeholders: Unique placeholder names found in the content
+            known: Flattened context the placeholders are looked up in
 
-            # Check if it's a required variable
-            is_required = any(
-                placeholder.startswith(pattern) or placeholder == pattern
-                for pattern in required_patterns
-            )
+        Returns:
+            Dictionary with validation results (see validate_placeholders)
+        """
+        # Placeholders not present in context, in a stable order
+        missing = sorted(placeholders - known.keys())
 
-            if is_required:
-                missing_required.append(placeholder)
-            else:
-                missing_optional.append(placeholder)
+        # Validation results
+        missing_required = [p for p in missing if p.startswith(_REQUIRED_PREFIXES)]
+        missing_optional = [p for p in missing if not p.startswith(_REQUIRED_PREFIXES)]
+        warnings = []
 
-                # Suggest default values for common variables
-                if placeholder in COMMON_DEFAULTS:
-                    suggestions[placeholder] = COMMON_DEFAULTS[placeholder]
-                else:
-                    # Try to suggest a value based on the variable name
-                    if "port" in placeholder:
-                        suggestions[placeholder] = "3000"
-                    elif "host" in placeholder or "url" in placeholder:
-                        if "database" in placeholder:
-                            suggestions[placeholder] = "localhost"
-                        elif "api" in placeholder:
-                            suggestions[placeholder] = "http://localhost:3000"
-                    elif "email" in placeholder:
-                        suggestions[placeholder] = "noreply@example.com"
+        # Suggest default values for common variables
+        suggestions = {}
+        for placeholder in missing_optional:
+            value = _suggest_default(placeholder)
+            if value is not None:
+                suggestions[placeholder] = value
 
         # Generate warnings
         if missing_required:
@@ -361,14 +543,13 @@ class ContextResolver:
         Returns:
             String with defaults applied
         """
-        result = content
+        if "{{" not in content or not defaults:
+            return content
 
-        for placeholder, default_value in defaults.items():
-            placeholder_str = f"{{{{{placeholder}}}}}"
-            if placeholder_str in result:
-                result = result.replace(placeholder_str, default_value)
+        def _sub(match: "re.Match[str]") -> str:
+            return defaults.get(match.group(1), match.group(0))
 
-        return result
+        return _PLACEHOLDER_RE.sub(_sub, content)
 
     def resolve_with_validation(self, content: str, strict: bool = False) -> Dict[str, Any]:
         """
@@ -386,8 +567,29 @@ class ContextResolver:
                 "success": bool
             }
         """
-        # First, validate placeholders
-        validation = self.validate_placeholders(content)
+        templated = "{{" in content
+        values = self._stringified_context() if templated else {}
+        seen: Set[str] = set()
+        unresolved: List[str] = []
+
+        def _sub(match: "re.Match[str]") -> str:
+            key = match.group(1)
+            seen.add(key)
+            if key in values:
+                return values[key]
+
+            # Apply suggestions for missing placeholders (in non-strict mode)
+            if not strict and not key.startswith(_REQUIRED_PREFIXES):
+                default = _suggest_default(key)
+                if default is not None:
+                    return default
+
+            unresolved.append(key)
+            return ""
+
+        # One pass both collects the placeholders and substitutes them
+        resolved_content = _PLACEHOLDER_RE.sub(_sub, content) if templated else content
+        validation = self._placeholder_report(seen, values)
 
         # If strict mode and missing required, return error
         if strict and not validation["is_valid"]:
@@ -397,12 +599,10 @@ class ContextResolver:
                 "success": False
             }
 
-        # Apply suggestions for missing placeholders (in non-strict mode)
-        if not strict and validation["suggestions"]:
-            content = self.apply_defaults(content, validation["suggestions"])
-
-        # Resolve placeholders
-        resolved_content = self.resolve_string(content)
+        if unresolved:
+            import warnings
+            for key in unresolved:
+                warnings.warn(f"Context variable not found: {{{{{key}}}}}")
 
         return {
             "content": resolved_content,
@@ -420,7 +620,10 @@ class ContextResolver:
         Returns:
             List of unique variable names
         """
-        matches = re.findall(r'\{\{([^}]+)\}\}', content)
+        if "{{" not in content:
+            return []
+
+        matches = _PLACEHOLDER_RE.findall(content)
         return list(set(matches))
 
 
@@ -439,27 +642,72 @@ def resolve_directory(
         input_dir: Input directory path
         output_dir: Output directory path
         resolver: ContextResolver instance
-        pattern: File pattern to match (default: "*.md")
+        pattern: File name pattern to match (default: "*.md")
+
+    Files are resolved on a thread pool; the resolver's context must not be
+    modified until this returns.
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    for input_file in input_dir.glob(pattern):
-        output_file = output_dir / input_file.name
-        resolver.resolve_file(input_file, output_file)
-        print(f"  ✓ Resolved: {input_file.name} -> {output_file}")
+    with os.scandir(input_dir) as entries:
+        files = [
+            (entry.path, output_dir / entry.name)
+            for entry in entries
+            if entry.is_file() and fnmatch(entry.name, pattern)
+        ]
+    if not files:
+        return
+
+    def _resolve(job: Tuple[str, Path]) -> Path:
+        input_path, output_file = job
+        content = Path(input_path).read_text(encoding='utf-8')
+
+        # Untemplated files are copied as-is
+        if "{{" not in content:
+            shutil.copyfile(input_path, output_file)
+        else:
+            output_file.write_text(resolver.resolve_string(content), encoding='utf-8')
+        return output_file
+
+    # Build the shared lookup table once, before the workers read it
+    resolver._stringified_context()
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(_RESOLVE_WORKERS, len(files))) as executor:
+        for output_file in executor.map(_resolve, files):
+            print(f"  ✓ Resolved: {output_file.name} -> {output_file}")
 
 
 def main():
     """CLI entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: python3 context_resolver.py <feature_dir> [--export OUTPUT_FILE] [--resolve-file INPUT OUTPUT] [--validate INPUT] [--strict]")
-        print("Example: python3 context_resolver.py .sam/001_user_auth --export CONTEXT_RESOLVED.yaml")
-        print("Example: python3 context_resolver.py .sam/001_user_auth --resolve-file input.md output.md")
-        print("Example: python3 context_resolver.py .sam/001_user_auth --validate TECHNICAL_SPEC.md")
-        print("Example: python3 context_resolver.py .sam/001_user_auth --validate TECHNICAL_SPEC.md --strict")
-        sys.exit(1)
-
-    feature_dir = Path(sys.argv[1])
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Resolve {{VARIABLE}} placeholders with SAM context values",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""Examples:
+  python3 context_resolver.py .sam/001_user_auth --export CONTEXT_RESOLVED.yaml
+  python3 context_resolver.py .sam/001_user_auth --resolve-file input.md output.md
+  python3 context_resolver.py .sam/001_user_auth --validate TECHNICAL_SPEC.md
+  python3 context_resolver.py .sam/001_user_auth --validate TECHNICAL_SPEC.md --strict""",
+    )
+    parser.add_argument('feature_dir', type=Path,
+                        help='Feature directory (e.g. .sam/001_user_auth)')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--export', type=Path, metavar='OUTPUT_FILE',
+                        help='Export the merged context (.yaml/.yml or JSON)')
+    action.add_argument('--resolve-file', type=Path, nargs=2, metavar=('INPUT', 'OUTPUT'),
+                        help='Resolve placeholders in INPUT and write OUTPUT')
+    action.add_argument('--validate', type=Path, metavar='INPUT',
+                        help='Check that every placeholder in INPUT can be resolved')
+    parser.add_argument('--strict', action='store_true',
+                        help='With --validate: missing required placeholders would fail generation')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='Skip the Context Summary listing')
+    args = parser.parse_args()
+
+    feature_dir = args.feature_dir
 
     if not feature_dir.exists():
         print(f"Error: Feature directory not found: {feature_dir}")
@@ -475,89 +723,69 @@ def main():
     print(f"  Global context: {resolver.global_context_path}")
     print(f"  Feature context: {resolver.feature_context_path}")
 
-    # Parse arguments
-    if len(sys.argv) >= 4:
-        if sys.argv[2] == "--export":
-            # Export resolved context
-            output_file = Path(sys.argv[3])
-            format = "yaml" if output_file.suffix == ".yaml" or output_file.suffix == ".yml" else "json"
-            resolver.export_context(output_file, format)
-            print(f"✓ Exported context to: {output_file}")
-
-            # Show context summary
-            print(f"\nContext Summary:")
-            for key, value in sorted(resolver._flatten_context().items()):
-                print(f"  {key}: {value}")
-
-        elif sys.argv[2] == "--resolve-file":
-            # Resolve a single file
-            if len(sys.argv) < 5:
-                print("Error: --resolve-file requires INPUT and OUTPUT arguments")
-                sys.exit(1)
-
-            input_file = Path(sys.argv[3])
-            output_file = Path(sys.argv[4])
-
-            if not input_file.exists():
-                print(f"Error: Input file not found: {input_file}")
-                sys.exit(1)
-
-            resolver.resolve_file(input_file, output_file)
-            print(f"✓ Resolved: {input_file} -> {output_file}")
-
-        elif sys.argv[2] == "--validate":
-            # Validate placeholders in a file
-            if len(sys.argv) < 4:
-                print("Error: --validate requires INPUT argument")
-                sys.exit(1)
-
-            input_file = Path(sys.argv[3])
-
-            if not input_file.exists():
-                print(f"Error: Input file not found: {input_file}")
-                sys.exit(1)
-
-            # Check for strict mode
-            strict = "--strict" in sys.argv
-
-            with open(input_file, 'r') as f:
-                content = f.read()
-
-            print(f"\n📋 Validating placeholders in: {input_file.name}")
-            print("=" * 60)
-
-            validation = resolver.validate_placeholders(content)
-
-            print(f"\nTotal placeholders found: {validation['total_placeholders']}")
-            print(f"Resolved placeholders: {validation['resolved_count']}")
-            print(f"Missing required: {len(validation['missing_required'])}")
-            print(f"Missing optional: {len(validation['missing_optional'])}")
-
-            if validation['missing_required']:
-                print(f"\n❌ Missing Required Placeholders:")
-                for var in validation['missing_required']:
-                    print(f"   - {{{{var}}}}")
-
-            if validation['missing_optional']:
-                print(f"\n⚠️  Missing Optional Placeholders:")
-                for var in validation['missing_optional']:
-                    print(f"   - {{{{var}}}}")
-                    if var in validation['suggestions']:
-                        print(f"     Suggested value: {validation['suggestions'][var]}")
-
-            if validation['warnings']:
-                print(f"\n⚠️  Warnings:")
-                for warning in validation['warnings']:
-                    print(f"   - {warning}")
-
-            if validation['is_valid']:
-                print(f"\n✅ Validation passed! All placeholders can be resolved.")
-                sys.exit(0)
-            else:
-                print(f"\n❌ Validation failed! Missing required placeholders.")
-                if strict:
-                    print("   (Strict mode: Would fail generation)")
-                sys.exit(1)
+    if args.export:
+        # Export resolved context
+        output_file = args.export
+        format = "yaml" if output_file.suffix == ".yaml" or output_file.suffix == ".yml" else "json"
+        resolver.export_context(output_file, format)
+        print(f"✓ Exported context to: {output_file}")
+
+    elif args.resolve_file:
+        # Resolve a single file
+        input_file, output_file = args.resolve_file
+
+        if not input_file.exists():
+            print(f"Error: Input file not found: {input_file}")
+            sys.exit(1)
+
+        resolver.resolve_file(input_file, output_file)
+        print(f"✓ Resolved: {input_file} -> {output_file}")
+
+    elif args.validate:
+        # Validate placeholders in a file
+        input_file = args.validate
+
+        if not input_file.exists():
+            print(f"Error: Input file not found: {input_file}")
+            sys.exit(1)
+
+        content = input_file.read_text(encoding='utf-8')
+
+        print(f"\n📋 Validating placeholders in: {input_file.name}")
+        print("=" * 60)
+
+        validation = resolver.validate_placeholders(content)
+
+        print(f"\nTotal placeholders found: {validation['total_placeholders']}")
+        print(f"Resolved placeholders: {validation['resolved_count']}")
+        print(f"Missing required: {len(validation['missing_required'])}")
+        print(f"Missing optional: {len(validation['missing_optional'])}")
+
+        if validation['missing_required']:
+            print(f"\n❌ Missing Required Placeholders:")
+            for var in validation['missing_required']:
+                print(f"   - {{{{var}}}}")
+
+        if validation['missing_optional']:
+            print(f"\n⚠️  Missing Optional Placeholders:")
+            for var in validation['missing_optional']:
+                print(f"   - {{{{var}}}}")
+                if var in validation['suggestions']:
+                    print(f"     Suggested value: {validation['suggestions'][var]}")
+
+        if validation['warnings']:
+            print(f"\n⚠️  Warnings:")
+            for warning in validation['warnings']:
+                print(f"   - {warning}")
+
+        if validation['is_valid']:
+            print(f"\n✅ Validation passed! All placeholders can be resolved.")
+            sys.exit(0)
+        else:
+            print(f"\n❌ Validation failed! Missing required placeholders.")
+            if args.strict:
+                print("   (Strict mode: Would fail generation)")
+            sys.exit(1)
 
     else:
         # Validate context
@@ -569,10 +797,14 @@ def main():
         else:
             print(f"\n✓ Context is valid")
 
-        # Show context summary
+    if not args.resolve_file and not args.quiet:
+        # Show context summary (export and plain runs)
+        summary = "\n".join(
+            f"  {key}: {value}" for key, value in sorted(resolver._flatten_context().items())
+        )
         print(f"\nContext Summary:")
-        for key, value in sorted(resolver._flatten_context().items()):
-            print(f"  {key}: {value}")
+        if summary:
+            print(summary)
 
     print(f"\n✓ Context resolution complete!")
 
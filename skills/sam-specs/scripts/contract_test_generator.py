@@ -9,21 +9,31 @@ specifications and catches breaking changes before deployment.
 Usage:
     python3 skills/sam-specs/scripts/contract_test_generator.py <feature_dir> --framework zod
     python3 skills/sam-specs/scripts/contract_test_generator.py .sam/001_user_auth --framework pact
+    python3 skills/sam-specs/scripts/contract_test_generator.py .sam/001_user_auth --force
     python3 skills/sam-specs/scripts/contract_test_generator.py .sam/001_user_auth --verify
 
 Output:
     Generates contract test files in the feature's tests/contract directory
+    (files whose SPEC-HASH header matches the current spec are left untouched
+    unless --force is given)
 """
 
 import sys
 import json
+import hashlib
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from dataclasses import dataclass, field
 import yaml
 import re
 
+# Prefer the libyaml bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 # Import context resolver for variable interpolation
 try:
     from context_resolver import ContextResolver
@@ -33,6 +43,15 @@ except ImportError:
     ContextResolver = None  # Type stub for when unavailable
 
 
+# Bump whenever generated output changes, so files from older versions are rewritten
+_GENERATOR_VERSION = "1"
+
+
+def _spec_cache_path(openapi_file: Path) -> Path:
+    """Hidden JSON sidecar holding the parsed spec, e.g. .openapi.yaml.cache.json."""
+    return openapi_file.with_name(f".{openapi_file.name}.cache.json")
+
+
 @dataclass
 class ContractTest:
     """Represents a contract test for an API endpoint."""
@@ -54,6 +73,8 @@ class ContractTestGenerator:
         self.feature_dir = feature_dir
         self.framework = framework.lower()
         self.openapi_spec: Dict[str, Any] = {}
+        self.spec_hash = ""
+        self.force = False
         self.contract_tests: List[ContractTest] = []
         self.use_context = use_context and CONTEXT_RESOLVER_AVAILABLE
         self.context_resolver: Optional[ContextResolver] = None
@@ -68,9 +89,48 @@ class ContractTestGenerator:
                 self.use_context = False
 
     def load_spec(self):
-        """Load the OpenAPI specification."""
-        with open(self.openapi_file, 'r') as f:
-            self.openapi_spec = yaml.safe_load(f)
+        """
+        Load the OpenAPI specification.
+
+        The parsed spec is cached as JSON next to the YAML file, keyed by the
+        SHA-1 of its bytes; json.loads is much cheaper than YAML parsing.
+        """
+        raw = self.openapi_file.read_bytes()
+        key = hashlib.sha1(raw).hexdigest()
+        # Identifies the generated output: spec bytes, framework and generator version
+        self.spec_hash = hashlib.sha256(
+            raw + self.framework.encode() + _GENERATOR_VERSION.encode()
+        ).hexdigest()
+        cache_path = _spec_cache_path(self.openapi_file)
+
+        try:
+            cached = json.loads(cache_path.read_bytes())
+        except (OSError, ValueError):
+            cached = None
+        if isinstance(cached, dict) and cached.get("key") == key:
+            self.openapi_spec = cached["spec"]
+            return
+
+        self.openapi_spec = yaml.load(raw, Loader=_Loader)
+        self._save_spec_cache(cache_path, key)
+
+    def _save_spec_cache(self, cache_path: Path, key: str):
+        """Write the JSON sidecar, unless the spec does not survive a JSON round trip."""
+        try:
+            payload = json.dumps({"key": key, "spec": self.openapi_spec})
+        except (TypeError, ValueError):
+            # Dates and other non-JSON YAML values
+            return
+        # Unquoted status codes load as int keys, which JSON would turn into strings
+        if json.loads(payload)["spec"] != self.openapi_spec:
+            return
+
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        try:
+            tmp_path.write_text(payload, encoding='utf-8')
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            print(f"  ⚠ Could not write spec cache: {e}")
 
     def resolve_context(self, template: str) -> str:
         """
@@ -86,8 +146,14 @@ class ContractTestGenerator:
             return self.context_resolver.resolve_string(template)
         return template
 
-    def generate_all(self):
-        """Generate all contract test files."""
+    def generate_all(self, force: bool = False):
+        """
+        Generate all contract test files.
+
+        Args:
+            force: Rewrite output files even if they match the current spec hash
+        """
+        self.force = force
         self.load_spec()
 
         if self.framework == "zod":
@@ -105,32 +171,51 @@ class ContractTestGenerator:
         tests_dir.mkdir(parents=True, exist_ok=True)
 
         # Generate Zod schemas file
-        schemas_file = tests_dir / "schemas.ts"
-        schemas_content = self._generate_zod_schemas()
-        with open(schemas_file, 'w') as f:
-            f.write(schemas_content)
-
-        print(f"✓ Generated Zod schemas: {schemas_file}")
+        self._write_generated(tests_dir / "schemas.ts", "Zod schemas", self._generate_zod_schemas)
 
         # Generate contract tests file
-        tests_file = tests_dir / "contract.test.ts"
-        tests_content = self._generate_zod_contract_tests()
-        with open(tests_file, 'w') as f:
-            f.write(tests_content)
-
-        print(f"✓ Generated Zod contract tests: {tests_file}")
+        self._write_generated(
+            tests_dir / "contract.test.ts", "Zod contract tests", self._generate_zod_contract_tests
+        )
 
         # Generate request validators
-        validators_file = tests_dir / "validators.ts"
-        validators_content = self._generate_request_validators()
-        with open(validators_file, 'w') as f:
-            f.write(validators_content)
+        self._write_generated(
+            tests_dir / "validators.ts", "request validators", self._generate_request_validators
+        )
+
+    def _write_generated(self, output_file: Path, label: str, build: Callable[[], str]):
+        """
+        Write a generated file, skipping the build when it is already current.
+
+        The first line of every generated file records the spec hash; if the
+        existing file carries the same hash nothing is rebuilt or rewritten.
+
+        Args:
+            output_file: File to write
+            label: Description used in progress output
+            build: Produces the file content
+        """
+        header = f"// SPEC-HASH: {self.spec_hash}\n"
+
+        if not self.force:
+            try:
+                with open(output_file, 'r') as f:
+                    if f.readline() == header:
+                        print(f"✓ {label} up to date (spec unchanged): {output_file}")
+                        return
+            except (OSError, UnicodeDecodeError):
+                pass
+
+        content = build()
+        with open(output_file, 'w') as f:
+            f.write(header)
+            f.write(content)
 
-        print(f"✓ Generated request validators: {validators_file}")
+        print(f"✓ Generated {label}: {output_file}")
 
     def _generate_zod_schemas(self) -> str:
         """Generate Zod schema definitions from OpenAPI spec."""
-        content = f'''/**
+        parts = [f'''/**
  * Auto-generated Zod schemas from OpenAPI specification
  * Source: {self.openapi_file.name}
  * Generated: {datetime.now().isoformat()}
@@ -161,7 +246,7 @@ export const PaginationSchema = z.object({{
   totalPages: z.number().int().nonnegative(),
 }});
 
-'''
+''']
 
         # Generate schemas from OpenAPI components
         schemas = self.openapi_spec.get('components', {}).get('schemas', {})
@@ -170,14 +255,14 @@ export const PaginationSchema = z.object({{
             if schema_name in ['Error', 'Pagination']:
                 continue
 
-            content += f"// {schema_name}\n"
-            content += f"export const {schema_name}Schema = "
+            parts.append(f"// {schema_name}\n")
+            parts.append(f"export const {schema_name}Schema = ")
 
             # Generate Zod schema from OpenAPI schema
-            zod_schema = self._openapi_to_zod(schema_def)
-            content += zod_schema + ";\n\n"
+            parts.append(self._openapi_to_zod(schema_def))
+            parts.append(";\n\n")
 
-        return content
+        return "".join(parts)
 
     def _openapi_to_zod(self, schema: Dict[str, Any], indent: int = 0) -> str:
         """Convert OpenAPI schema to Zod schema string."""
@@ -200,7 +285,7 @@ export const PaginationSchema = z.object({{
                 else:
                     props.append(f"{prefix}  {prop_name}: {prop_schema.strip()}.optional(),")
 
-            return f"z.object({{{}\n{prefix}}})".format("\n".join(props))
+            return "z.object({{\n{}\n{}}})".format("\n".join(props), prefix)
 
         elif schema_type == 'array':
             items = self._openapi_to_zod(schema.get('items', {}), indent + 1)
@@ -242,7 +327,7 @@ export const PaginationSchema = z.object({{
         """Generate Zod contract test file."""
         paths = self.openapi_spec.get('paths', {})
 
-        content = f'''/**
+        parts = [f'''/**
  * Auto-generated contract tests from OpenAPI specification
  * Source: {self.openapi_file.name}
  * Generated: {datetime.now().isoformat()}
@@ -261,30 +346,37 @@ describe('Contract Tests', () => {{
     // authToken = await login();
   }});
 
-'''
+''']
 
         for path, path_item in paths.items():
             for method, operation in path_item.items():
                 if method in ['get', 'post', 'put', 'delete', 'patch']:
-                    content += self._generate_endpoint_test(path, method, operation)
+                    self._generate_endpoint_test(parts, path, method, operation)
 
-        content += "});\n"
-        return content
+        parts.append("});\n")
+        return "".join(parts)
 
-    def _generate_endpoint_test(self, path: str, method: str, operation: Dict[str, Any]) -> str:
-        """Generate test for a single endpoint."""
+    def _generate_endpoint_test(
+        self, parts: List[str], path: str, method: str, operation: Dict[str, Any]
+    ) -> None:
+        """
+        Generate the tests for a single endpoint.
+
+        Mutates parts in place, appending the endpoint's describe block
+        rather than returning it.
+        """
         summary = operation.get('summary', f'{method.upper()} {path}')
         operation_id = operation.get('operationId', f'{method}_{path.replace("/", "_")}')
         responses = operation.get('responses', {})
 
-        content = f"""
+        parts.append(f"""
   describe('{summary}', () => {{
-"""
+""")
 
         # Success response test
         if '200' in responses or '201' in responses:
             status_code = '200' if '200' in responses else '201'
-            content += f"""
+            parts.append(f"""
     it('should return {status_code} with valid response schema', async () => {{
       const response = await request(app)
         .{method}('{path}'{self._get_auth_param(operation)})
@@ -295,12 +387,12 @@ describe('Contract Tests', () => {{
       expect(result.success).toBe(true);
       expect(result.errors).toEqual([]);
     }});
-"""
+""")
 
         # Error response tests
         for status in ['400', '401', '404', '500']:
             if status in responses:
-                content += f"""
+                parts.append(f"""
     it('should return {status} for error case', async () => {{
       const response = await request(app)
         .{method}('{path}')
@@ -311,10 +403,9 @@ describe('Contract Tests', () => {{
       expect(result.success).toBe(true);
       expect(response.body.error).toBeDefined();
     }});
-"""
+""")
 
-        content += "  });\n"
-        return content
+        parts.append("  });\n")
 
     def _get_auth_param(self, operation: Dict[str, Any]) -> str:
         """Get authentication parameter for request."""
@@ -392,7 +483,15 @@ export function validateResponse(data: any, schemaName: string): {
         tests_dir = self.feature_dir / "tests" / "contract" / "pact"
         tests_dir.mkdir(parents=True, exist_ok=True)
 
-        content = f'''/**
+        self._write_generated(
+            tests_dir / "pact.test.ts", "Pact contract tests", self._generate_pact_content
+        )
+
+    def _generate_pact_content(self) -> str:
+        """Generate Pact contract test file."""
+        info = self.openapi_spec.get('info', {})
+
+        return f'''/**
  * Auto-generated Pact contract tests from OpenAPI specification
  * Source: {self.openapi_file.name}
  * Generated: {datetime.now().isoformat()}
@@ -406,8 +505,8 @@ const {{ like, eachLike }} = Matchers;
 
 describe('Contract Tests', () => {{
   const provider = new Pact({{
-    consumer: '{self.openapi_spec.get('info', {{}}).get('title', 'API Consumer')}',
-    provider: '{self.openapi_spec.get('info', {{}}).get('title', 'API Provider')}',
+    consumer: '{info.get('title', 'API Consumer')}',
+    provider: '{info.get('title', 'API Provider')}',
     port: 1234,
     log: './logs/pact.log',
     dir: './pacts',
@@ -443,18 +542,16 @@ describe('Contract Tests', () => {{
 }});
 '''
 
-        tests_file = tests_dir / "pact.test.ts"
-        with open(tests_file, 'w') as f:
-            f.write(content)
-
-        print(f"✓ Generated Pact contract tests: {tests_file}")
-
     def _generate_joi_tests(self):
         """Generate Joi schema validation tests."""
         tests_dir = self.feature_dir / "tests" / "contract" / "joi"
         tests_dir.mkdir(parents=True, exist_ok=True)
 
-        content = f'''/**
+        self._write_generated(tests_dir / "schemas.ts", "Joi schemas", self._generate_joi_schemas)
+
+    def _generate_joi_schemas(self) -> str:
+        """Generate Joi schema definitions."""
+        return f'''/**
  * Auto-generated Joi schema validators from OpenAPI specification
  * Source: {self.openapi_file.name}
  * Generated: {datetime.now().isoformat()}
@@ -479,12 +576,6 @@ export const paginationSchema = Joi.object({{
 // Add more schemas based on your OpenAPI specification
 '''
 
-        schemas_file = tests_dir / "schemas.ts"
-        with open(schemas_file, 'w') as f:
-            f.write(content)
-
-        print(f"✓ Generated Joi schemas: {schemas_file}")
-
 
 def verify_contracts(feature_dir: Path) -> bool:
     """Verify contracts against implementation."""
@@ -515,7 +606,8 @@ def verify_contracts(feature_dir: Path) -> bool:
 def main():
     """CLI entry point."""
     if len(sys.argv) < 2:
-        print("Usage: python3 contract_test_generator.py <feature_dir> [--framework zod|pact|joi] [--verify]")
+        print("Usage: python3 contract_test_generator.py <feature_dir> "
+              "[--framework zod|pact|joi] [--force] [--verify]")
         print("Example: python3 contract_test_generator.py .sam/001_user_auth --framework zod")
         print("Example: python3 contract_test_generator.py .sam/001_user_auth --verify")
         sys.exit(1)
@@ -523,6 +615,7 @@ def main():
     feature_dir = Path(sys.argv[1])
     framework = "zod"
     verify_only = False
+    force = "--force" in sys.argv
 
     # Parse optional arguments
     if len(sys.argv) >= 3:
@@ -550,7 +643,7 @@ def main():
     print(f"Generating {framework.upper()} contract tests from: {openapi_file}")
 
     generator = ContractTestGenerator(openapi_file, feature_dir, framework)
-    generator.generate_all()
+    generator.generate_all(force=force)
 
     print(f"\n✓ Contract test generation complete!")
     print(f"  Framework: {framework.upper()}")
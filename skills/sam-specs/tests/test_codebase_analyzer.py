@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unit tests for codebase_analyzer.py
+
+Tests source scanning, .gitignore pruning and the analysis cache.
+"""
+
+import sys
+import os
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+# Add scripts directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from codebase_analyzer import HybridCodebaseAnalyzer
+
+logging.disable(logging.CRITICAL)
+
+
+def test_gitignored_source_dir():
+    """Test ignored top-level source directories are not scanned."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+
+        (tmpdir / ".gitignore").write_text("lib/\n")
+        (tmpdir / "lib" / "sub").mkdir(parents=True)
+        (tmpdir / "lib" / "a.ts").write_text("")
+        (tmpdir / "lib" / "sub" / "b.ts").write_text("")
+        (tmpdir / "src").mkdir()
+        (tmpdir / "src" / "index.ts").write_text("")
+
+        analyzer = HybridCodebaseAnalyzer(tmpdir)
+        context = analyzer.analyze(use_cache=False)
+
+        # Only src is reported; nothing from lib or below it
+        assert list(context.components) == ["src"]
+        assert context.components["src"] == ["src/index.ts"]
+
+        print("✓ test_gitignored_source_dir passed")
+
+
+def test_hidden_service_files():
+    """Test dotfiles in src/services are reported like any other .ts file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        services_dir = tmpdir / "src" / "services"
+        services_dir.mkdir(parents=True)
+        (services_dir / "auth.ts").write_text("")
+        (services_dir / ".draft.ts").write_text("")
+        (services_dir / ".ts").write_text("")
+        (services_dir / "README.md").write_text("")
+
+        context = HybridCodebaseAnalyzer(tmpdir).analyze(use_cache=False)
+
+        # Matches Path.glob("*.ts") and Path.stem
+        assert sorted(context.services) == [".draft", ".ts", "auth"]
+
+        print("✓ test_hidden_service_files passed")
+
+
+def test_cache_opt_in():
+    """Test analyze() only reads and writes the cache when asked to."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / ".sam").mkdir()
+        (tmpdir / "src").mkdir()
+        (tmpdir / "src" / "index.ts").write_text("")
+        cache_file = tmpdir / ".sam" / ".codebase_context_cache.json"
+
+        HybridCodebaseAnalyzer(tmpdir).analyze()
+        assert not cache_file.exists()
+
+        HybridCodebaseAnalyzer(tmpdir).analyze(use_cache=True)
+        assert cache_file.exists()
+
+        # A second cached run restores the same context
+        context = HybridCodebaseAnalyzer(tmpdir).analyze(use_cache=True)
+        assert context.components == {"src": ["src/index.ts"]}
+
+        print("✓ test_cache_opt_in passed")
+
+
+def test_cache_invalidation():
+    """Test source and manifest changes, including mid-scan edits, force a rescan."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / ".sam").mkdir()
+        (tmpdir / "src").mkdir()
+        (tmpdir / "src" / "index.ts").write_text("")
+        pkg_json = tmpdir / "package.json"
+        pkg_json.write_text(json.dumps({"dependencies": {}}))
+
+        HybridCodebaseAnalyzer(tmpdir).analyze(use_cache=True)
+
+        # A new source file changes its directory's signature
+        (tmpdir / "src" / "App.tsx").write_text("")
+        context = HybridCodebaseAnalyzer(tmpdir).analyze(use_cache=True)
+        assert sorted(context.components["src"]) == ["src/App.tsx", "src/index.ts"]
+
+        # An edited manifest does too
+        pkg_json.write_text(json.dumps({"dependencies": {"react": "^18.0.0"}}))
+        context = HybridCodebaseAnalyzer(tmpdir).analyze(use_cache=True)
+        assert context.tech_stack.get("framework") == "React ^18.0.0"
+
+        class EditingAnalyzer(HybridCodebaseAnalyzer):
+            """Edits package.json after it has been read, during the source scan."""
+
+            def _scan_source_structure(self):
+                super()._scan_source_structure()
+                pkg_json.write_text(json.dumps({"dependencies": {"express": "^4.0.0"}}))
+                stat = pkg_json.stat()
+                os.utime(pkg_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        # Force a rescan, during which the manifest changes after being read
+        (tmpdir / "src" / "Other.ts").write_text("")
+        context = EditingAnalyzer(tmpdir).analyze(use_cache=True)
+        assert "src/Other.ts" in context.components["src"]
+        assert "backend" not in context.tech_stack
+
+        # The cache recorded the manifest as it was read, so the edit is picked up
+        context = HybridCodebaseAnalyzer(tmpdir).analyze(use_cache=True)
+        assert context.tech_stack.get("backend") == "Express"
+
+        print("✓ test_cache_invalidation passed")
+
+
+def test_malformed_cache():
+    """Test a cache file of the wrong shape falls back to a rescan."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / ".sam").mkdir()
+        (tmpdir / "src").mkdir()
+        (tmpdir / "src" / "index.ts").write_text("")
+        cache_file = tmpdir / ".sam" / ".codebase_context_cache.json"
+
+        HybridCodebaseAnalyzer(tmpdir).analyze(use_cache=True)
+        valid = json.loads(cache_file.read_text())
+
+        missing_inputs = dict(valid)
+        del missing_inputs["inputs"]
+        unknown_field = json.loads(json.dumps(valid))
+        unknown_field["context"]["renamed_field"] = []
+
+        for payload in ([1, 2], {"version": valid["version"]}, missing_inputs, unknown_field):
+            cache_file.write_text(json.dumps(payload))
+            context = HybridCodebaseAnalyzer(tmpdir).analyze(use_cache=True)
+            assert context.components == {"src": ["src/index.ts"]}
+
+        print("✓ test_malformed_cache passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running codebase_analyzer tests...")
+    print()
+
+    test_gitignored_source_dir()
+    test_hidden_service_files()
+    test_cache_opt_in()
+    test_cache_invalidation()
+    test_malformed_cache()
+
+    print()
+    print("✓ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,13 +8,15 @@ Tests context variable loading, merging, and interpolation.
 import sys
 import os
 import tempfile
+import warnings
 import json
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from context_resolver import ContextResolver
+import context_resolver
+from context_resolver import ContextResolver, clear_context_file_cache, resolve_directory
 
 
 def test_context_loading():
@@ -139,6 +141,62 @@ api:
         print("✓ test_resolve_string passed")
 
 
+def test_resolve_missing_placeholder():
+    """Test unknown placeholders are dropped and values are not re-expanded."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        feature_dir = tmpdir / "feature"
+        feature_dir.mkdir()
+
+        ctx_file = feature_dir / "CONTEXT.yaml"
+        ctx_file.write_text("""
+application:
+  name: "MyApp"
+  tagline: "{{application.name}} rocks"
+""")
+
+        resolver = ContextResolver(feature_dir)
+        resolver.load_context()
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            result = resolver.resolve_string("{{application.name}}: {{missing.key}}!")
+        assert result == "MyApp: !"
+        assert any("{{missing.key}}" in str(w.message) for w in caught)
+
+        # Substituted values are inserted literally
+        result = resolver.resolve_string("{{application.tagline}}")
+        assert result == "{{application.name}} rocks"
+
+        print("✓ test_resolve_missing_placeholder passed")
+
+
+def test_resolve_non_str_keys():
+    """Test placeholders for YAML keys that load as non-str values."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        feature_dir = tmpdir / "feature"
+        feature_dir.mkdir()
+
+        ctx_file = feature_dir / "CONTEXT.yaml"
+        ctx_file.write_text("""
+404: "Not Found"
+2024:
+  budget: 100
+""")
+
+        resolver = ContextResolver(feature_dir)
+        resolver.load_context()
+
+        result = resolver.resolve_string("{{404}} / {{2024.budget}}")
+        assert result == "Not Found / 100"
+
+        validation = resolver.validate_placeholders("{{404}}")
+        assert validation["missing_optional"] == []
+
+        print("✓ test_resolve_non_str_keys passed")
+
+
 def test_deep_merge():
     """Test deep merge of global and feature context."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -233,6 +291,214 @@ def test_set_get_value():
         print("✓ test_set_get_value passed")
 
 
+def test_flatten_cache_invalidation():
+    """Test the flattened context is refreshed after modifications."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        feature_dir = tmpdir / "feature"
+        feature_dir.mkdir()
+
+        resolver = ContextResolver(feature_dir)
+        resolver.load_context()
+
+        resolver.set_value("application.name", "First")
+        assert resolver.resolve_string("{{application.name}}") == "First"
+
+        # set_value updates an existing leaf in the cache
+        resolver.set_value("application.name", "Second")
+        assert resolver.resolve_string("{{application.name}}") == "Second"
+
+        # Replacing a leaf with a mapping rebuilds the cache
+        resolver.set_value("application.name", {"short": "S"})
+        flat = resolver._flatten_context()
+        assert "application.name" not in flat
+        assert flat["application.name.short"] == "S"
+
+        # get_value serves leaves from the cache and walks for mappings
+        assert resolver.get_value("application.name.short") == "S"
+        assert resolver.get_value("application.name") == {"short": "S"}
+
+        # _deep_merge invalidates the cache
+        resolver._deep_merge({"application": {"version": "2.0"}})
+        assert resolver._flatten_context()["application.version"] == "2.0"
+
+        print("✓ test_flatten_cache_invalidation passed")
+
+
+def test_direct_context_mutation():
+    """Test changes made directly to resolver.context are resolved."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        feature_dir = tmpdir / "feature"
+        feature_dir.mkdir()
+        (feature_dir / "CONTEXT.yaml").write_text("""
+application:
+  name: "MyApp"
+""")
+
+        resolver = ContextResolver(feature_dir)
+        resolver.load_context()
+        assert resolver.resolve_string("{{application.name}}") == "MyApp"
+        assert resolver.get_value("application.name") == "MyApp"
+
+        # Nested and top-level edits, as well as reassigning the whole dict
+        resolver.context["application"]["name"] = "Renamed"
+        assert resolver.resolve_string("{{application.name}}") == "Renamed"
+        assert resolver.get_value("application.name") == "Renamed"
+
+        resolver.context["api"] = {"url": "https://api.test.com"}
+        assert resolver.resolve_string("{{api.url}}") == "https://api.test.com"
+
+        resolver.context = {"application": {"name": "Replaced"}}
+        assert resolver.resolve_string("{{application.name}}") == "Replaced"
+        assert resolver.get_value("api.url") is None
+
+        print("✓ test_direct_context_mutation passed")
+
+
+def test_shared_global_context():
+    """Test resolvers sharing a global context do not leak merged values."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+
+        global_ctx = tmpdir / "CONTEXT.yaml"
+        global_ctx.write_text("""
+application:
+  name: "GlobalApp"
+""")
+
+        feature_a = tmpdir / "feature_a"
+        feature_a.mkdir()
+        (feature_a / "CONTEXT.yaml").write_text("""
+application:
+  name: "FeatureA"
+""")
+        feature_b = tmpdir / "feature_b"
+        feature_b.mkdir()
+
+        resolver_a = ContextResolver(feature_a, global_context_path=global_ctx)
+        resolver_a.load_context()
+        assert resolver_a.get_value("application.name") == "FeatureA"
+
+        resolver_b = ContextResolver(feature_b, global_context_path=global_ctx)
+        resolver_b.load_context()
+        assert resolver_b.get_value("application.name") == "GlobalApp"
+
+        print("✓ test_shared_global_context passed")
+
+
+def test_global_context_lookup():
+    """Test global CONTEXT.yaml lookups are keyed on the resolved directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir).resolve()
+        for name in ("one", "two"):
+            (tmpdir / name / "feature").mkdir(parents=True)
+        (tmpdir / "one" / "CONTEXT.yaml").write_text("application:\n  name: One\n")
+
+        cwd = os.getcwd()
+        try:
+            # The same relative path names a different directory after chdir
+            os.chdir(tmpdir / "one")
+            resolver = ContextResolver(Path("feature"))
+            assert resolver.global_context_path == Path("CONTEXT.yaml")
+
+            os.chdir(tmpdir / "two")
+            resolver = ContextResolver(Path("feature"))
+            assert resolver.global_context_path != Path("CONTEXT.yaml")
+
+            # Files created after a lookup are seen once the cache is cleared
+            (tmpdir / "two" / "CONTEXT.yaml").write_text("application:\n  name: Two\n")
+            clear_context_file_cache()
+            resolver = ContextResolver(Path("feature"))
+            assert resolver.global_context_path == Path("CONTEXT.yaml")
+        finally:
+            os.chdir(cwd)
+
+        print("✓ test_global_context_lookup passed")
+
+
+def test_yaml_cache_bounded():
+    """Test the parsed CONTEXT.yaml cache replaces stale entries and stays bounded."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        ctx_file = tmpdir / "CONTEXT.yaml"
+        ctx_file.write_text("application:\n  name: First\n")
+        assert context_resolver._load_yaml_cached(ctx_file)["application"]["name"] == "First"
+
+        # An edited file replaces its entry instead of adding one
+        ctx_file.write_text("application:\n  name: Second!\n")
+        assert context_resolver._load_yaml_cached(ctx_file)["application"]["name"] == "Second!"
+        assert list(context_resolver._YAML_CACHE).count(str(ctx_file)) == 1
+
+        for i in range(context_resolver._YAML_CACHE_SIZE + 5):
+            other = tmpdir / f"CONTEXT_{i}.yaml"
+            other.write_text(f"index: {i}\n")
+            context_resolver._load_yaml_cached(other)
+        assert len(context_resolver._YAML_CACHE) == context_resolver._YAML_CACHE_SIZE
+        assert str(ctx_file) not in context_resolver._YAML_CACHE
+
+        print("✓ test_yaml_cache_bounded passed")
+
+
+def test_resolve_directory():
+    """Test resolving every matching file in a directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        feature_dir = tmpdir / "feature"
+        feature_dir.mkdir()
+        (feature_dir / "CONTEXT.yaml").write_text("""
+application:
+  name: "MyApp"
+""")
+
+        input_dir = tmpdir / "input"
+        input_dir.mkdir()
+        (input_dir / "spec.md").write_text("# {{application.name}}\n")
+        (input_dir / "plain.md").write_text("# No placeholders\n")
+        (input_dir / "notes.txt").write_text("{{application.name}}\n")
+        (input_dir / "nested.md").mkdir()
+
+        resolver = ContextResolver(feature_dir)
+        resolver.load_context()
+
+        output_dir = tmpdir / "output"
+        resolve_directory(feature_dir, input_dir, output_dir, resolver)
+
+        assert (output_dir / "spec.md").read_text() == "# MyApp\n"
+        assert (output_dir / "plain.md").read_text() == "# No placeholders\n"
+        assert not (output_dir / "notes.txt").exists()
+        assert not (output_dir / "nested.md").exists()
+
+        print("✓ test_resolve_directory passed")
+
+
+def test_resolve_with_validation_defaults():
+    """Test suggested defaults are applied when resolving non-strictly."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        feature_dir = tmpdir / "feature"
+        feature_dir.mkdir()
+        (feature_dir / "CONTEXT.yaml").write_text("""
+application:
+  name: "MyApp"
+""")
+
+        resolver = ContextResolver(feature_dir)
+        resolver.load_context()
+
+        content = "{{application.name}} on port {{database.port}}"
+        result = resolver.resolve_with_validation(content)
+        assert result["success"] is True
+        assert result["content"] == "MyApp on port 5432"
+        assert result["validation"]["suggestions"] == {"database.port": "5432"}
+
+        # apply_defaults only touches the given placeholders
+        applied = resolver.apply_defaults(content, {"database.port": "5432"})
+        assert applied == "{{application.name}} on port 5432"
+
+        print("✓ test_resolve_with_validation_defaults passed")
+
+
 def main():
     """Run all tests."""
     print("Running context_resolver tests...")
@@ -241,9 +507,18 @@ def main():
     test_context_loading()
     test_flatten_context()
     test_resolve_string()
+    test_resolve_missing_placeholder()
+    test_resolve_non_str_keys()
     test_deep_merge()
     test_validation()
     test_set_get_value()
+    test_flatten_cache_invalidation()
+    test_direct_context_mutation()
+    test_shared_global_context()
+    test_global_context_lookup()
+    test_yaml_cache_bounded()
+    test_resolve_directory()
+    test_resolve_with_validation_defaults()
 
     print()
     print("✓ All tests passed!")